@@ -1,25 +1,119 @@
+import os
+
 from flask import Flask
 from flask.blueprints import Blueprint
 from flask_cors import CORS
 from flask_restful import Api
 from waitress import serve
 
-from utils import config
+from utils import config, metrics
 
 import routes
+from resources.history import warm_history
+from resources.players import warm_players
+from resources.scores import warm_scores
+from utils.dataset import players_dataset
+from utils.prefork import serve_prefork
+from utils.scheduler import CachedSource, Periodic
 
 app = Flask(__name__)
 api = Api(app)
-cors = CORS(app, resources={r"/api/*": {"origins": "*"}})
+cors = CORS(
+    app, resources={r"/api/*": {"origins": "*", "expose_headers": ["X-Total-Count"]}}
+)
 
 app.debug = config.DEBUG
+metrics.instrument(app)
 
 for blueprint in vars(routes).values():
     if isinstance(blueprint, Blueprint):
         app.register_blueprint(blueprint, url_prefix="/api")
 
+
+def prepare(year_data):
+    warm_players(year_data)
+    warm_scores(year_data)
+
+
+def warm():
+    # Every season file; seasons only in the SQLite store are loaded when
+    # first asked for
+    for year in players_dataset.season_years():
+        prepare(players_dataset.get_year(year))
+    warm_history()
+
+
+"""
+========================================
+Background refresh
+========================================
+"""
+
+
+def reload_datasets():
+    if players_dataset.reload(prepare):
+        warm_history()
+
+
+def pipeline_job(on_update=None):
+    # The scrapers' dependencies are only imported when the refresh is enabled
+    from data import scrape_auction_data, scrape_projections
+    from data.players import Fetchers
+    from data.players import main as setup_players
+
+    fetchers = Fetchers(
+        projections=CachedSource(scrape_projections, config.PROJECTIONS_INTERVAL),
+        auction=CachedSource(scrape_auction_data, config.PROJECTIONS_INTERVAL),
+    )
+
+    def refresh_players():
+        if setup_players([], fetchers) == "updated" and on_update:
+            on_update()
+
+    return refresh_players
+
+
+def start_reloader():
+    # New seasons are swapped in by this thread only, once warmed
+    players_dataset.auto_reload = False
+    return Periodic("dataset_reload", reload_datasets, config.RELOAD_INTERVAL).start()
+
+
+def start_background():
+    reloader = start_reloader()
+    Periodic(
+        "pipeline", pipeline_job(reloader.trigger), config.REFRESH_INTERVAL
+    ).start()
+
+
+def pipeline():
+    # Prefork service: the workers' reloaders pick up the files it writes
+    Periodic("pipeline", pipeline_job(), config.REFRESH_INTERVAL).run()
+
+
 if __name__ == "__main__":
+    background = config.REFRESH_INTERVAL > 0
     if app.debug:
+        # The reloader runs this module again in the child that serves; the
+        # parent only watches files, so it must not warm or refresh too
+        if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+            warm()
+            if background:
+                start_background()
         app.run(host=config.HOST, port=config.PORT)
+    elif config.WORKERS > 1 and hasattr(os, "fork"):
+        serve_prefork(
+            app,
+            config.HOST,
+            config.PORT,
+            config.WORKERS,
+            config.THREADS,
+            preload=warm,
+            worker_init=start_reloader if background else None,
+            services=[pipeline] if background else [],
+        )
     else:
-        serve(app, host=config.HOST, port=config.PORT)
+        warm()
+        if background:
+            start_background()
+        serve(app, host=config.HOST, port=config.PORT, threads=config.THREADS)
@@ -0,0 +1,108 @@
+"""
+Latency and throughput of the players API under waitress.
+
+The app is served by waitress on a free local port and hit by concurrent
+keep-alive clients; every request's latency is recorded. --url targets a
+server that is already running instead, e.g. one started with WORKERS=4.
+
+    PYTHONPATH=. python3 -m benchmarks.bench_api --clients 8 --output api.json
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from waitress import create_server
+
+from app import app
+
+from .timing import summarize, write_results
+
+SCENARIOS = {
+    "players_br": ("/api/players/{year}", {"Accept-Encoding": "br"}),
+    "players_gzip": ("/api/players/{year}", {"Accept-Encoding": "gzip"}),
+    "players_identity": ("/api/players/{year}", {"Accept-Encoding": "identity"}),
+    "players_page": (
+        "/api/players/{year}?fields=rank,stats&sort=-pts&limit=50",
+        {"Accept-Encoding": "gzip"},
+    ),
+    "scores": ("/api/players/{year}/scores?punt=fg,to", {"Accept-Encoding": "gzip"}),
+}
+
+
+def client(url, headers, count):
+    samples = []
+    with requests.Session() as session:
+        for _ in range(count):
+            start = time.perf_counter()
+            # Read the raw bytes: decompressing is the client's cost, not ours
+            response = session.get(url, headers=headers, stream=True)
+            response.raise_for_status()
+            response.raw.read(decode_content=False)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run_scenario(url, headers, clients, count):
+    client(url, headers, 2)  # Warm the server-side caches
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        runs = list(executor.map(lambda _: client(url, headers, count), range(clients)))
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for run in runs for sample in run]
+    stats = summarize(samples)
+    stats["p50_ms"] = stats["median_ms"]
+    stats["requests_per_s"] = len(samples) / elapsed
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--year", default="2024")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50, help="per client")
+    parser.add_argument("--threads", type=int, default=8, help="waitress threads")
+    parser.add_argument("--url", help="running server, e.g. http://127.0.0.1:5000")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        server = create_server(app, host="127.0.0.1", port=0, threads=args.threads)
+        threading.Thread(target=server.run, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.effective_port}"
+
+    try:
+        results = {
+            name: run_scenario(
+                base_url + path.format(year=args.year),
+                headers,
+                args.clients,
+                args.requests,
+            )
+            for name, (path, headers) in SCENARIOS.items()
+        }
+    finally:
+        if server:
+            server.close()
+
+    write_results(
+        {
+            "benchmark": "api",
+            "year": args.year,
+            "clients": args.clients,
+            "threads": None if args.url else args.threads,
+            "url": args.url,
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
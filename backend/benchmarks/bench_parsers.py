@@ -0,0 +1,74 @@
+"""
+Parse-time benchmark for the Hashtag table parsers.
+
+Saved pages can be passed with --projections/--past-year/--auction;
+otherwise pages are rendered from a stored season (benchmarks/fixtures).
+
+    PYTHONPATH=. python3 -m benchmarks.bench_parsers --output parsers.json
+"""
+
+import argparse
+
+from data.get_hashtag_data import (
+    parse_auction_data,
+    parse_past_year_stats,
+    parse_projections,
+)
+from utils import storage
+
+from . import fixtures
+from .timing import measure, write_results
+
+PARSERS = {
+    "projections": (parse_projections, fixtures.render_projections),
+    "past_year": (parse_past_year_stats, fixtures.render_past_year_stats),
+    "auction": (parse_auction_data, fixtures.render_auction_data),
+}
+
+
+def load_page(path, render, players):
+    if path:
+        with open(path) as f:
+            return f.read()
+    return render(players)
+
+
+def run(pages, repeat):
+    results = {}
+    for name, (parse, _) in PARSERS.items():
+        page = pages[name]
+        stats = measure(lambda: parse(page), repeat)
+        stats["rows"] = len(parse(page))
+        stats["bytes"] = len(page.encode())
+        results[name] = stats
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--year", default="2024")
+    parser.add_argument("--projections")
+    parser.add_argument("--past-year")
+    parser.add_argument("--auction")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    players = storage.read_season(args.year)["players"]
+    paths = {
+        "projections": args.projections,
+        "past_year": args.past_year,
+        "auction": args.auction,
+    }
+    pages = {
+        name: load_page(paths[name], render, players)
+        for name, (_, render) in PARSERS.items()
+    }
+    write_results(
+        {"benchmark": "hashtag_parsers", "results": run(pages, args.repeat)},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
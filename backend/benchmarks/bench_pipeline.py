@@ -0,0 +1,75 @@
+"""
+Stage benchmark for the data/players.py pipeline.
+
+Source records are rebuilt from an archived season (data/archive), so the
+stages run on real names and stats without any network access:
+
+    roster_merge       merge_players as a full refresh runs it: name
+                       indexes, matching, fingerprints and Players
+    stats_aggregation  StatsTable.from_players
+    calc_categories    category means/stds and shooting impacts
+    json_write         write_season to a temporary directory
+
+    PYTHONPATH=. python3 -m benchmarks.bench_pipeline --output pipeline.json
+"""
+
+import argparse
+import logging
+import tempfile
+
+from data import StatsTable, calc_categories
+from data.players import merge_players, proj_year_key
+from utils import storage
+
+from . import fixtures
+from .timing import measure, write_results
+
+
+def run(year, repeat):
+    archived = storage.read_archive(year)["players"]
+    roster = fixtures.roster_records(archived)
+    hashtag = fixtures.hashtag_rows(archived)
+    auction = fixtures.auction_rows(archived)
+
+    players, _, _ = merge_players(proj_year_key, True, roster, hashtag, auction)
+    table = StatsTable.from_players(players)
+    totals, per, _, _ = calc_categories(table)
+
+    with tempfile.TemporaryDirectory() as seasons_dir:
+        stages = {
+            "roster_merge": lambda: merge_players(
+                proj_year_key, True, roster, hashtag, auction
+            ),
+            "stats_aggregation": lambda: StatsTable.from_players(players),
+            "calc_categories": lambda: calc_categories(table),
+            "json_write": lambda: storage.write_season(
+                year, players, totals, per, seasons_dir=seasons_dir
+            ),
+        }
+        results = {name: measure(stage, repeat) for name, stage in stages.items()}
+
+    results["players"] = len(players)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--year", default="2024")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    # The name indexes log every unmatched name on each run
+    logging.disable(logging.INFO)
+    write_results(
+        {
+            "benchmark": "pipeline",
+            "year": args.year,
+            "results": run(args.year, args.repeat),
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
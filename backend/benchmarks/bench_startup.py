@@ -0,0 +1,110 @@
+"""
+Cold start benchmark: import time of the API and of the pipeline.
+
+Each target is imported in a fresh interpreter under `-X importtime`, and
+its total import time is checked against a budget. The API must not
+import any of the scrapers' modules. --check exits non-zero when a budget
+is exceeded or a forbidden module is imported.
+
+    PYTHONPATH=. python3 -m benchmarks.bench_startup --check
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .timing import summarize, write_results
+
+# name -> (statement, import time budget in ms, modules it must not import).
+# Budgets are 1.5x the measured median (api ~430 ms, pipeline ~335 ms), so
+# only a real regression fails on a slower or busy machine.
+TARGETS = {
+    "api": ("import app", 650, ("data", "lxml", "requests", "multiprocessing")),
+    "pipeline": ("import data.players", 500, ()),
+}
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_once(statement):
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR}
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    return wall_ms, parse_importtime(process.stderr)
+
+
+def run(repeat, top):
+    results = {}
+    for name, (statement, budget_ms, forbidden) in TARGETS.items():
+        walls, imports = [], []
+        for _ in range(repeat):
+            wall_ms, modules = run_once(statement)
+            walls.append(wall_ms)
+            imports.append(sum(self_us for self_us, _ in modules.values()) / 1000)
+        # Slowest modules of the last run, by cumulative time
+        slowest = sorted(modules.items(), key=lambda item: -item[1][1])[:top]
+        import_ms = statistics.median(imports)
+        imported = sorted(
+            module
+            for module in forbidden
+            if any(m == module or m.startswith(f"{module}.") for m in modules)
+        )
+        results[name] = {
+            "statement": statement,
+            "process": summarize(walls),
+            "import": summarize(imports),
+            "modules": len(modules),
+            "budget_ms": budget_ms,
+            "over_budget": import_ms > budget_ms,
+            "forbidden_imported": imported,
+            "slowest": [
+                {"module": m, "self_ms": s / 1000, "cumulative_ms": c / 1000}
+                for m, (s, c) in slowest
+            ],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output")
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.top)
+    write_results({"benchmark": "startup", "results": results}, args.output)
+
+    failures = [
+        name
+        for name, result in results.items()
+        if result["over_budget"] or result["forbidden_imported"]
+    ]
+    if args.check and failures:
+        sys.exit(f"Startup budget exceeded: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
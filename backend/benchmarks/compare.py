@@ -0,0 +1,43 @@
+"""
+Compare two benchmark result files, e.g. from two commits.
+
+    PYTHONPATH=. python3 -m benchmarks.compare old/api.json new/api.json
+"""
+
+import argparse
+import json
+
+
+def rows(results, prefix=""):
+    # Flattens nested results into (name, stats) pairs with a median_ms
+    for name, value in results.items():
+        if isinstance(value, dict) and "median_ms" in value:
+            yield prefix + name, value
+        elif isinstance(value, dict):
+            yield from rows(value, f"{prefix}{name}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="% slowdown to flag"
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = dict(rows(json.load(f)["results"]))
+    with open(args.candidate) as f:
+        candidate = dict(rows(json.load(f)["results"]))
+
+    print(f"{'benchmark':<32}{'baseline':>12}{'candidate':>12}{'change':>10}")
+    for name in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[name]["median_ms"], candidate[name]["median_ms"]
+        change = (new - old) / old * 100 if old else 0.0
+        flag = "  <-- slower" if change > args.threshold else ""
+        print(f"{name:<32}{old:>10.2f}ms{new:>10.2f}ms{change:>9.1f}%{flag}")
+
+
+if __name__ == "__main__":
+    main()
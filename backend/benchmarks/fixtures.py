@@ -0,0 +1,151 @@
+"""
+Hashtag-style pages rendered from a stored season, for when no saved
+pages are at hand. They follow the layout the parsers in
+data/get_hashtag_data.py expect: a header row repeated every 50 rows,
+shooting fractions in a float-end span and stats in the first span.
+"""
+
+from data.get_hashtag_data import TABLE_ID
+
+
+def stat_cell(value):
+    return f"<td><span>{value}</span><br /><small>0.00</small></td>"
+
+
+def fraction_cell(made, attempted):
+    pct = made / attempted if attempted else 0
+    return (
+        f"<td>{pct:.3f}<br />"
+        f'<span class="float-end">({made}/{attempted})</span></td>'
+    )
+
+
+def auction_cell(value):
+    return f"<td>${value}</td>" if value else "<td>$</td>"
+
+
+def render_page(rows, header_cells):
+    header = "<tr>" + "".join(f"<td>{cell}</td>" for cell in header_cells) + "</tr>"
+    body = []
+    for i, row in enumerate(rows):
+        if i % 50 == 0:
+            body.append(header)
+        body.append(row)
+    return (
+        f'<html><body><form method="post" id="form1">'
+        f'<table id="{TABLE_ID}"><tbody>{"".join(body)}</tbody></table>'
+        "</form></body></html>"
+    )
+
+
+def player_name(player):
+    return f"{player['first_name']} {player['last_name']}"
+
+
+def shooting_and_stats(stats):
+    return (
+        fraction_cell(stats["fgm"], stats["fga"])
+        + fraction_cell(stats["ftm"], stats["fta"])
+        + "".join(
+            stat_cell(stats[key])
+            for key in ["tpm", "pts", "reb", "ast", "stl", "blk", "to"]
+        )
+        + stat_cell(0.0)
+    )
+
+
+def render_projections(players):
+    rows = [
+        f"<tr><td>{p['rank']}<small></small></td><td>{p['adp'] or ''}</td>"
+        f"<td><a>{player_name(p)}</a></td><td>{'/'.join(p['positions'])}</td>"
+        f"<td>{p['team']}</td><td>{p['stats']['gp']}</td>"
+        f"<td>{p['stats']['mpg']}</td>" + shooting_and_stats(p["stats"]) + "</tr>"
+        for p in players
+    ]
+    return render_page(rows, ["R#", "ADP", "PLAYER"])
+
+
+def render_past_year_stats(players):
+    rows = [
+        f"<tr><td>{p['rank']}</td><td><a>{player_name(p)}</a></td>"
+        f"<td>{'/'.join(p['positions'])}</td><td>{p['team']}</td>"
+        f"<td>{p['stats']['gp']}</td><td>{p['stats']['mpg']}</td>"
+        + shooting_and_stats(p["stats"])
+        + "</tr>"
+        for p in players
+    ]
+    return render_page(rows, ["R#", "PLAYER"])
+
+
+def render_auction_data(players):
+    rows = [
+        f"<tr><td>{p['rank']}</td><td><a>{player_name(p)}</a></td>"
+        + "<td></td>" * 5
+        + auction_cell(p["auction_hashtag"])
+        + auction_cell(p["auction_yahoo_avg"])
+        + auction_cell(p["auction_espn_avg"])
+        + auction_cell(p["auction_blend_avg"])
+        + "</tr>"
+        for p in players
+    ]
+    return render_page(rows, ["R#", "PLAYER"])
+
+
+"""
+Source records for the pipeline stages, shaped like the outputs of
+get_rosters and the Hashtag parsers.
+"""
+
+
+def roster_records(players):
+    return [
+        {
+            "id": p["id"],
+            "first_name": p["first_name"],
+            "last_name": p["last_name"],
+            "display_name": player_name(p),
+            "team_id": p["team_id"],
+            "team": p["team"],
+            "age": p["age"],
+            "headshot": p["headshot"],
+            "years_pro": p["years_pro"],
+            "jersey": p["jersey"],
+            "height": p["height"],
+            "weight": p["weight"],
+            "injuries": p["injuries"],
+            "draft": p["draft"],
+        }
+        for p in players
+    ]
+
+
+def hashtag_rows(players):
+    return [
+        {
+            "rank": p["rank"],
+            "adp": p["adp"],
+            "name": player_name(p),
+            "positions": p["positions"],
+            "team": p["team"],
+            **{key: p["stats"][key] for key in ["gp", "mpg", "fgm", "fga"]},
+            **{key: p["stats"][key] for key in ["ftm", "fta", "pts", "reb"]},
+            **{key: p["stats"][key] for key in ["ast", "stl", "blk", "to"]},
+            "3pm": p["stats"]["tpm"],
+        }
+        for p in players
+        if p["stats"] is not None
+    ]
+
+
+def auction_rows(players):
+    return [
+        {
+            "name": player_name(p),
+            # Archived seasons still use the old auction_valued_at key
+            "valued_at": p.get("auction_hashtag", p.get("auction_valued_at")) or 0.0,
+            "yahoo_avg": p["auction_yahoo_avg"] or 0.0,
+            "espn_avg": p["auction_espn_avg"] or 0.0,
+            "blend_avg": p["auction_blend_avg"] or 0.0,
+        }
+        for p in players
+    ]
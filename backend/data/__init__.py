@@ -1,17 +1,36 @@
-from .get_espn_data import get_rosters
-from .get_hashtag_data import (
-    scrape_projections,
-    scrape_past_year_stats,
-    scrape_auction_data,
-)
-from .players import main as setup_players
-from .calc_categories import calc_categories
-
-__all__ = [
-    "calc_categories",
-    "get_rosters",
-    "scrape_projections",
-    "scrape_past_year_stats",
-    "scrape_auction_data",
-    "setup_players",
-]
+"""
+The ingestion pipeline. The scrapers and the pipeline's entry point are
+imported on first use, so that importing one part (e.g. the category
+stats) doesn't load the scrapers' dependencies too; the API never
+imports this package.
+"""
+
+import importlib
+
+# Eager, as it only needs numpy, and the function must shadow the
+# submodule of the same name
+from .calc_categories import StatsTable, calc_categories
+
+# Exported name -> (module, attribute)
+_exports = {
+    "get_rosters": (".get_espn_data", "get_rosters"),
+    "scrape_projections": (".get_hashtag_data", "scrape_projections"),
+    "scrape_past_year_stats": (".get_hashtag_data", "scrape_past_year_stats"),
+    "scrape_auction_data": (".get_hashtag_data", "scrape_auction_data"),
+    "setup_players": (".players", "main"),
+}
+
+__all__ = ["StatsTable", "calc_categories", *_exports]
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _exports[name]
+    value = getattr(importlib.import_module(module, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
@@ -1,49 +1,141 @@
-def calc_categories(
-    players, category_sums, league_avg_fg_pct, league_avg_ft_pct, use_totals
-):
-    players_count = len(players)
-    category_means = [sum / players_count for sum in category_sums]
-    fg_impact_sum, ft_impact_sum = 0, 0
-    min_fg_impact, max_fg_impact = float("inf"), float("-inf")
-    min_ft_impact, max_ft_impact = float("inf"), float("-inf")
-
-    for player in players:
-        fg_diff = (
-            (player.stats.fgm / player.stats.fga - league_avg_fg_pct)
-            if player.stats.fga != 0
-            else 0
+import numpy as np
+
+from models import PlayerStats
+
+category_keys = [
+    "fgm",
+    "fga",
+    "ftm",
+    "fta",
+    "tpm",
+    "pts",
+    "reb",
+    "ast",
+    "stl",
+    "blk",
+    "to",
+    "fg_impact",
+    "ft_impact",
+]
+
+counting_keys = category_keys[:11]
+
+_gp_field = PlayerStats.fields.index("gp")
+_counting_fields = [PlayerStats.fields.index(key) for key in counting_keys]
+
+
+class StatsTable:
+    """
+    Columnar view of a player pool: gp plus one column per counting stat.
+
+    Rows follow the order of the players it was built from, so results can
+    be written back by index. Any subset of a pool (a custom player pool,
+    a roster) can be turned into a table and recomputed on its own.
+    """
+
+    gp: np.ndarray  # (players,)
+    per_game: np.ndarray  # (players, counting categories)
+
+    def __init__(self, gp, per_game):
+        self.gp = np.asarray(gp, dtype=np.float64)
+        self.per_game = np.asarray(per_game, dtype=np.float64).reshape(
+            len(self.gp), len(counting_keys)
         )
-        ft_diff = (
-            (player.stats.ftm / player.stats.fta - league_avg_ft_pct)
-            if player.stats.fta != 0
-            else 0
+
+    @classmethod
+    def from_players(cls, players):
+        # Player models from models/player.py, read from their stats arrays
+        values = np.array([player.stats.values for player in players]).reshape(
+            len(players), len(PlayerStats.fields)
         )
-        if use_totals:
-            fg_diff *= player.stats.gp
-            ft_diff *= player.stats.gp
-        player.stats.fg_impact = fg_diff * player.stats.fga
-        player.stats.ft_impact = ft_diff * player.stats.fta
-        fg_impact_sum += player.stats.fg_impact
-        ft_impact_sum += player.stats.ft_impact
-        min_fg_impact = min(min_fg_impact, player.stats.fg_impact)
-        max_fg_impact = max(max_fg_impact, player.stats.fg_impact)
-        min_ft_impact = min(min_ft_impact, player.stats.ft_impact)
-        max_ft_impact = max(max_ft_impact, player.stats.ft_impact)
-
-    fg_imp_mean = fg_impact_sum / players_count
-    fg_imp_min = min_fg_impact
-    fg_imp_max = max_fg_impact
-
-    ft_imp_mean = ft_impact_sum / players_count
-    ft_imp_min = min_ft_impact
-    ft_imp_max = max_ft_impact
+        return cls(values[:, _gp_field], values[:, _counting_fields])
+
+    @classmethod
+    def from_records(cls, records):
+        # Serialized players, as stored in data/seasons/<year>.json
+        return cls(
+            [record["stats"]["gp"] for record in records],
+            [[record["stats"][key] for key in counting_keys] for record in records],
+        )
+
+    def __len__(self):
+        return len(self.gp)
+
+    def subset(self, rows):
+        return StatsTable(self.gp[rows], self.per_game[rows])
+
+    @property
+    def totals(self):
+        return self.per_game * self.gp[:, None]
+
+    def column(self, key):
+        return self.per_game[:, counting_keys.index(key)]
+
+
+def shooting_impact(made, attempted, gp, use_totals):
+    # Volume-weighted difference to the league average; 0 without attempts
+    scale = gp if use_totals else 1.0
+    league_avg = np.sum(made * scale) / np.sum(attempted * scale)
+    pct = np.divide(made, attempted, out=np.zeros_like(made), where=attempted != 0)
+    diff = np.where(attempted != 0, pct - league_avg, 0.0) * scale
+    return diff * attempted
+
+
+def calc_categories(table):
+    """
+    Compute min, max, mean (and std for totals) of every category for both
+    totals and per game stats, plus each player's per game FG/FT impact.
+
+    Returns (category_stats_totals, category_stats_per, fg_impact, ft_impact)
+    where the impacts are arrays in the table's row order.
+    """
+    gp = table.gp
+    fgm, fga = table.column("fgm"), table.column("fga")
+    ftm, fta = table.column("ftm"), table.column("fta")
+
+    impacts_totals = np.column_stack(
+        [
+            shooting_impact(fgm, fga, gp, True),
+            shooting_impact(ftm, fta, gp, True),
+        ]
+    )
+    impacts_per = np.column_stack(
+        [
+            shooting_impact(fgm, fga, gp, False),
+            shooting_impact(ftm, fta, gp, False),
+        ]
+    )
+    values_totals = np.hstack([table.totals, impacts_totals])
+    values_per = np.hstack([table.per_game, impacts_per])
+
+    mins_t, maxs_t = values_totals.min(axis=0), values_totals.max(axis=0)
+    means_t = values_totals.mean(axis=0)
+    mins_p, maxs_p = values_per.min(axis=0), values_per.max(axis=0)
+    means_p = values_per.mean(axis=0)
+
+    # Spread of totals is measured with the per game impacts scaled by gp,
+    # matching what the frontend's z-scores compare against the means.
+    spread = np.hstack([table.totals, impacts_per * gp[:, None]])
+    stds_t = np.sqrt(np.mean((spread - means_t) ** 2, axis=0))
+
+    category_stats_totals = {}
+    category_stats_per = {}
+    for i, key in enumerate(category_keys):
+        category_stats_totals[key] = {
+            "min": float(mins_t[i]),
+            "max": float(maxs_t[i]),
+            "mean": float(means_t[i]),
+            "std": float(stds_t[i]),
+        }
+        category_stats_per[key] = {
+            "min": float(mins_p[i]),
+            "max": float(maxs_p[i]),
+            "mean": float(means_p[i]),
+        }
 
     return (
-        category_means,
-        fg_imp_mean,
-        fg_imp_min,
-        fg_imp_max,
-        ft_imp_mean,
-        ft_imp_min,
-        ft_imp_max,
+        category_stats_totals,
+        category_stats_per,
+        impacts_per[:, 0],
+        impacts_per[:, 1],
     )
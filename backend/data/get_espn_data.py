@@ -1,80 +1,95 @@
 import logging
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import config
+
+from .sessions import create_session, fetch_json
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+NO_HEADSHOT_URL = "https://secure.espncdn.com/combiner/i?img=/i/headshots/nophoto.png"
+
+
+def parse_player(player, team_id, team_abbreviation):
+    return {
+        "id": int(player["id"]),
+        "first_name": player["firstName"],
+        "last_name": player["lastName"],
+        "display_name": player["displayName"],
+        "team_id": team_id,
+        "team": team_abbreviation,
+        "age": int(player["age"]) if "age" in player else None,
+        "headshot": (
+            (player["headshot"]["href"]) if "headshot" in player else NO_HEADSHOT_URL
+        ),
+        "years_pro": int(player["experience"]["years"]),
+        "jersey": int(player["jersey"]) if "jersey" in player else None,
+        "height": int(player["height"]) if "height" in player else None,
+        "weight": int(player["weight"]) if "weight" in player else None,
+        "injuries": [
+            {
+                "id": int(injury["id"]),
+                "long_comment": (
+                    injury["longComment"] if "longComment" in injury else None
+                ),
+                "short_comment": (
+                    injury["shortComment"] if "shortComment" in injury else None
+                ),
+                "status": injury["status"],
+                "date": injury["date"],
+                "details": (injury["details"] if "details" in injury else None),
+            }
+            for injury in player.get("injuries", [])
+        ],
+        "draft": (
+            {
+                "year": (player["draft"]["year"]),
+                "round": (player["draft"]["round"]),
+                "selection": (player["draft"]["selection"]),
+            }
+            if "draft" in player
+            else None
+        ),
+    }
+
 
-def get_rosters():
-    teams_url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams"
-    teams_response = requests.get(teams_url)
-    teams_data = teams_response.json()
+def get_rosters(
+    base_url=config.ESPN_API_URL, session=None, max_workers=config.HTTP_WORKERS
+):
+    if session is not None:
+        return fetch_rosters(base_url, session, max_workers)
+    # A session made here is closed with its pooled connections once done
+    with create_session(pool_size=max_workers) as session:
+        return fetch_rosters(base_url, session, max_workers)
 
+
+def fetch_rosters(base_url, session, max_workers):
+    teams_data = fetch_json(session, f"{base_url}/teams")
     teams_list = teams_data["sports"][0]["leagues"][0]["teams"]
+    team_ids = [int(team["team"]["id"]) for team in teams_list]
 
-    players_list = []
-    for team in teams_list:
-        team_id = int(team["team"]["id"])
-        roster_url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams/{team_id}?enable=roster"
-        roster_response = requests.get(roster_url)
-        roster_data = roster_response.json()
-        roster_players = roster_data["team"]["athletes"]
+    # Rosters are fetched concurrently; map() keeps them in team order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        rosters = list(
+            executor.map(
+                lambda team_id: fetch_json(
+                    session, f"{base_url}/teams/{team_id}?enable=roster"
+                ),
+                team_ids,
+            )
+        )
 
-        for player in roster_players:
+    players_list = []
+    for team, team_id, roster_data in zip(teams_list, team_ids, rosters):
+        for player in roster_data["team"]["athletes"]:
             try:
-                player_data = {
-                    "id": int(player["id"]),
-                    "first_name": player["firstName"],
-                    "last_name": player["lastName"],
-                    "display_name": player["displayName"],
-                    "team_id": team_id,
-                    "team": team["team"]["abbreviation"],
-                    "age": int(player["age"]) if "age" in player else None,
-                    "headshot": (
-                        (player["headshot"]["href"])
-                        if "headshot" in player
-                        else "https://secure.espncdn.com/combiner/i?img=/i/headshots/nophoto.png"
-                    ),
-                    "years_pro": int(player["experience"]["years"]),
-                    "jersey": int(player["jersey"]) if "jersey" in player else None,
-                    "height": int(player["height"]) if "height" in player else None,
-                    "weight": int(player["weight"]) if "weight" in player else None,
-                    "injuries": [
-                        {
-                            "id": int(injury["id"]),
-                            "long_comment": (
-                                injury["longComment"]
-                                if "longComment" in injury
-                                else None
-                            ),
-                            "short_comment": (
-                                injury["shortComment"]
-                                if "shortComment" in injury
-                                else None
-                            ),
-                            "status": injury["status"],
-                            "date": injury["date"],
-                            "details": (
-                                injury["details"] if "details" in injury else None
-                            ),
-                        }
-                        for injury in player.get("injuries", [])
-                    ],
-                    "draft": (
-                        {
-                            "year": (player["draft"]["year"]),
-                            "round": (player["draft"]["round"]),
-                            "selection": (player["draft"]["selection"]),
-                        }
-                        if "draft" in player
-                        else None
-                    ),
-                }
-                players_list.append(player_data)
-
-            except:
+                players_list.append(
+                    parse_player(player, team_id, team["team"]["abbreviation"])
+                )
+            except (KeyError, TypeError, ValueError):
                 logger.error(f"Error parsing player data: {player}")
 
     return players_list
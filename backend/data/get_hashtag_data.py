@@ -1,16 +1,182 @@
-import time
 import logging
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+
+from utils import config
+
+from .sessions import create_session
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+PROJECTIONS_URL = "https://hashtagbasketball.com/fantasy-basketball-projections"
+RANKINGS_URL = "https://hashtagbasketball.com/fantasy-basketball-rankings"
+AUCTION_URL = "https://hashtagbasketball.com/fantasy-basketball-auction-values"
+
+TABLE_ID = "ContentPlaceHolder1_GridView1"
+DDSHOW = "ctl00$ContentPlaceHolder1$DDSHOW"
+DDPOSFROM = "ctl00$ContentPlaceHolder1$DDPOSFROM"
+DDDURATION = "ctl00$ContentPlaceHolder1$DDDURATION"
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+# Sent with each request, so a session passed in is left unchanged
+HEADERS = {"User-Agent": USER_AGENT}
+
+
+"""
+========================================
+Dropdown choices, applied in order like a user would
+========================================
+"""
+
+
+class OptionText:
+    def __init__(self, text):
+        self.text = text
+
+    def pick(self, options):
+        # options: [(text, value)]
+        return next(value for text, value in options if text == self.text)
+
+    def xpath(self, select_id):
+        return f"//*[@id='{select_id}']/option[text()='{self.text}']"
+
+
+class OptionIndex:
+    def __init__(self, index):
+        self.index = index
+
+    def pick(self, options):
+        return options[self.index][1]
+
+    def xpath(self, select_id):
+        return f"//*[@id='{select_id}']/option[{self.index + 1}]"
+
+
+SHOW_ALL = (DDSHOW, OptionText("All"))
+ESPN_POSITIONS = (DDPOSFROM, OptionIndex(1))
+PAST_YEAR = (DDDURATION, OptionIndex(1))
+
+
+def control_id(name):
+    # ctl00$ContentPlaceHolder1$DDSHOW -> ContentPlaceHolder1_DDSHOW
+    return name.split("$", 1)[1].replace("$", "_")
+
+
+"""
+========================================
+Page fetching
+========================================
+"""
+
+
+class ScrapeError(Exception):
+    pass
+
+
+def postback(session, url, html, name, choice):
+    # Replays an ASP.NET autopostback: every form field (viewstate, event
+    # validation, current dropdown values) is sent back with the new value.
+    form = next(
+        (form for form in lxml.html.fromstring(html).forms if name in form.inputs),
+        None,
+    )
+    if form is None:
+        raise ScrapeError(f"No form with field {name} on {url}")
+
+    options = [
+        (option.text_content().strip(), option.get("value", option.text_content()))
+        for option in form.inputs[name].xpath("option")
+    ]
+    fields = dict(form.form_values())
+    fields[name] = choice.pick(options)
+    fields["__EVENTTARGET"] = name
+    fields["__EVENTARGUMENT"] = ""
+
+    response = session.post(
+        urljoin(url, form.action or url),
+        data=fields,
+        headers=HEADERS,
+        timeout=config.HTTP_TIMEOUT,
+    )
+    response.raise_for_status()
+    return response.text
+
+
+def fetch_page_http(url, steps, session=None):
+    if session is not None:
+        return replay_page(session, url, steps)
+    # A session made here is closed with its pooled connections once done
+    with create_session(pool_size=1) as session:
+        return replay_page(session, url, steps)
+
+
+def replay_page(session, url, steps):
+    response = session.get(url, headers=HEADERS, timeout=config.HTTP_TIMEOUT)
+    response.raise_for_status()
+    html = response.text
+    for name, choice in steps:
+        html = postback(session, url, html, name, choice)
+
+    if TABLE_ID not in html:
+        raise ScrapeError(f"No stats table in response from {url}")
+    return html
+
+
+def fetch_page_selenium(url, steps):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions
+    from selenium.webdriver.support.ui import WebDriverWait
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(
+        service=ChromeService(ChromeDriverManager().install()), options=options
+    )
+
+    try:
+        driver.get(url)
+        for name, choice in steps:
+            option = driver.find_element(By.XPATH, choice.xpath(control_id(name)))
+            if option.is_selected():
+                continue
+            table = driver.find_element(By.ID, TABLE_ID)
+            option.click()
+            # Each choice posts the page back; wait for the table to be replaced
+            WebDriverWait(driver, config.HTTP_TIMEOUT).until(
+                expected_conditions.staleness_of(table)
+            )
+        return driver.page_source
+
+    finally:
+        driver.quit()
+
+
+def fetch_page(url, steps, session=None):
+    logger.info(f"Fetching {url}")
+    try:
+        return fetch_page_http(url, steps, session)
+    except Exception as e:
+        logger.warning(f"HTTP scrape of {url} failed ({e}), falling back to Selenium")
+        return fetch_page_selenium(url, steps)
+
+
+"""
+========================================
+Table parsing
+========================================
+"""
+
 
 def parse_position(position):
     # Format of "PG/SG" or "C"
@@ -19,16 +185,6 @@ def parse_position(position):
     return position.split("/")
 
 
-def get_numerator(fraction):
-    fraction = fraction[1:-1]
-    return float(fraction.split("/")[0])
-
-
-def get_denominator(fraction):
-    fraction = fraction[1:-1]
-    return float(fraction.split("/")[1])
-
-
 def parse_auction(value):
     if value == "$":
         return 0.0
@@ -45,225 +201,159 @@ def fix_abbreviations(abbreviation):
     return abbreviation
 
 
-def scrape_projections():
-    url = "https://hashtagbasketball.com/fantasy-basketball-projections"
+def parse_adp(value):
+    return float(value) if value else 140.0
 
-    driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()))
-    driver.maximize_window()
 
-    try:
-        logger.info(f"Starting projections scrape for URL: {url}")
-        driver.get(url)
+def parse_fraction(fraction):
+    # "(8.8/18.6)" -> (8.8, 18.6)
+    numerator, denominator = fraction[1:-1].split("/")
+    return float(numerator), float(denominator)
 
-        # Toggle to ALL players
-        dropdown = driver.find_element(By.NAME, "ctl00$ContentPlaceHolder1$DDSHOW")
-        dropdown.click()
-        time.sleep(1)
-        all_option = driver.find_element(By.XPATH, "//option[text()='All']")
-        all_option.click()
-
-        logger.info("Waiting for table to update")
-        time.sleep(1)
-
-        # Toggle position eligibilities to ESPN
-        dropdown2 = driver.find_element(By.NAME, "ctl00$ContentPlaceHolder1$DDPOSFROM")
-        dropdown2.click()
-        time.sleep(1)
-        espn_option = driver.find_element(
-            By.XPATH, '//*[@id="ContentPlaceHolder1_DDPOSFROM"]/option[2]'
-        )
-        espn_option.click()
-
-        logger.info("Waiting for table to update p.2")
-        time.sleep(2)
-
-        page_source = driver.page_source
-
-        logger.info("Parsing HTML")
-        soup = BeautifulSoup(page_source, "html.parser")
-
-        players = []
-        table = soup.find("table", {"id": "ContentPlaceHolder1_GridView1"})
-
-        if table:
-            tbody = table.find("tbody")
-            rows = tbody.find_all("tr")[1:]
-            for row in rows:
-                cols = row.find_all("td")
-                if cols[0].text == "R#":
-                    continue
-                player = {
-                    "rank": int(cols[0].find(text=True, recursive=False).strip()),
-                    "adp": (
-                        float(cols[1].text.strip()) if cols[1].text.strip() else 140.0
-                    ),
-                    "name": cols[2].text.strip(),
-                    "positions": parse_position(cols[3].text.strip()),
-                    "team": fix_abbreviations(cols[4].text.strip()),
-                    "gp": float(cols[5].text.strip()),
-                    "mpg": float(cols[6].text.strip()),
-                    "fgm": get_numerator(
-                        cols[7].find("span", class_="float-end").text.strip()
-                    ),
-                    "fga": get_denominator(
-                        cols[7].find("span", class_="float-end").text.strip()
-                    ),
-                    "ftm": get_numerator(
-                        cols[8].find("span", class_="float-end").text.strip()
-                    ),
-                    "fta": get_denominator(
-                        cols[8].find("span", class_="float-end").text.strip()
-                    ),
-                    "3pm": float(cols[9].find("span").text.strip()),
-                    "pts": float(cols[10].find("span").text.strip()),
-                    "reb": float(cols[11].find("span").text.strip()),
-                    "ast": float(cols[12].find("span").text.strip()),
-                    "stl": float(cols[13].find("span").text.strip()),
-                    "blk": float(cols[14].find("span").text.strip()),
-                    "to": float(cols[15].find("span").text.strip()),
-                    "total": float(cols[16].find("span").text.strip()),
-                }
-                players.append(player)
-        return players
 
-    finally:
-        driver.quit()
+"""
+Cell readers. Each one reads a <td> once; the schemas below say which
+reader and converter produce which fields, so every row is handled in a
+single pass without re-querying cells.
+"""
 
+_html_parser = etree.HTMLParser()
+_stats_table = etree.XPath(f"//table[@id='{TABLE_ID}']")
+_float_end_span = etree.XPath(
+    ".//span[contains(concat(' ', normalize-space(@class), ' '), ' float-end ')]"
+)
 
-def scrape_past_year_stats():
-    url = "https://hashtagbasketball.com/fantasy-basketball-rankings"
 
-    driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()))
-    driver.maximize_window()
+def read_own_text(cell):
+    # Text directly inside the cell, ignoring nested elements
+    return (cell.text or "").strip()
 
-    try:
-        logger.info(f"Starting rankings scrape for URL: {url}")
-        driver.get(url)
 
-        # Toggle to ALL players
-        dropdown1 = driver.find_element(By.NAME, "ctl00$ContentPlaceHolder1$DDSHOW")
-        dropdown1.click()
-        time.sleep(1)
-        all_option = driver.find_element(By.XPATH, "//option[text()='All']")
-        all_option.click()
-        logger.info("Waiting for table to update p.1")
-        time.sleep(1)
-
-        # Toggle to past year stats; second option in dropdown (value = 1)
-        dropdown2 = driver.find_element(By.NAME, "ctl00$ContentPlaceHolder1$DDDURATION")
-        dropdown2.click()
-        time.sleep(1)
-        past_year_option = driver.find_element(
-            By.XPATH, '//*[@id="ContentPlaceHolder1_DDDURATION"]/option[2]'
-        )
-        past_year_option.click()
-
-        # Toggle position eligibilities to ESPN
-        dropdown3 = driver.find_element(By.NAME, "ctl00$ContentPlaceHolder1$DDPOSFROM")
-        dropdown3.click()
-        time.sleep(1)
-        espn_option = driver.find_element(
-            By.XPATH, '//*[@id="ContentPlaceHolder1_DDPOSFROM"]/option[2]'
-        )
-        espn_option.click()
-
-        logger.info("Waiting for table to update p.2")
-        time.sleep(2)
-
-        page_source = driver.page_source
-
-        logger.info("Parsing HTML")
-        soup = BeautifulSoup(page_source, "html.parser")
-
-        players = []
-        table = soup.find("table", {"id": "ContentPlaceHolder1_GridView1"})
-
-        if table:
-            tbody = table.find("tbody")
-            rows = tbody.find_all("tr")[1:]
-            for row in rows:
-                cols = row.find_all("td")
-                if cols[0].text == "R#":
-                    continue
-                player = {
-                    "rank": int(cols[0].text.strip()),
-                    "name": cols[1].text.strip(),
-                    "positions": parse_position(cols[2].text.strip()),
-                    "team": fix_abbreviations(cols[3].text.strip()),
-                    "gp": float(cols[4].text.strip()),
-                    "mpg": float(cols[5].text.strip()),
-                    "fgm": get_numerator(
-                        cols[6].find("span", class_="float-end").text.strip()
-                    ),
-                    "fga": get_denominator(
-                        cols[6].find("span", class_="float-end").text.strip()
-                    ),
-                    "ftm": get_numerator(
-                        cols[7].find("span", class_="float-end").text.strip()
-                    ),
-                    "fta": get_denominator(
-                        cols[7].find("span", class_="float-end").text.strip()
-                    ),
-                    "3pm": float(cols[8].find("span").text.strip()),
-                    "pts": float(cols[9].find("span").text.strip()),
-                    "reb": float(cols[10].find("span").text.strip()),
-                    "ast": float(cols[11].find("span").text.strip()),
-                    "stl": float(cols[12].find("span").text.strip()),
-                    "blk": float(cols[13].find("span").text.strip()),
-                    "to": float(cols[14].find("span").text.strip()),
-                    "total": float(cols[15].find("span").text.strip()),
-                }
-                players.append(player)
-        return players
+def read_text(cell):
+    return "".join(cell.itertext()).strip()
 
-    finally:
-        driver.quit()
 
+def read_span(cell):
+    return read_text(cell.find(".//span"))
 
-def scrape_auction_data():
-    url = "https://hashtagbasketball.com/fantasy-basketball-auction-values"
 
-    driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()))
-    driver.maximize_window()
+def read_float_end_span(cell):
+    return read_text(_float_end_span(cell)[0])
 
-    try:
-        logger.info(f"Starting auctions scrape for URL: {url}")
-        driver.get(url)
 
-        # Toggle to ALL players
-        dropdown = driver.find_element(By.NAME, "ctl00$ContentPlaceHolder1$DDSHOW")
-        dropdown.click()
-        time.sleep(1)
-        all_option = driver.find_element(By.XPATH, "//option[text()='All']")
-        all_option.click()
-
-        logger.info("Waiting for table to update")
-        time.sleep(2)
-
-        page_source = driver.page_source
-
-        logger.info("Parsing HTML")
-        soup = BeautifulSoup(page_source, "html.parser")
-
-        players = []
-        table = soup.find("table", {"id": "ContentPlaceHolder1_GridView1"})
-
-        if table:
-            tbody = table.find("tbody")
-            rows = tbody.find_all("tr")[1:]
-            for row in rows:
-                cols = row.find_all("td")
-                if cols[0].text == "R#":
-                    continue
-                player = {
-                    "name": cols[1].text.strip(),
-                    "valued_at": parse_auction(cols[7].text.strip()),
-                    "yahoo_avg": parse_auction(cols[8].text.strip()),
-                    "espn_avg": parse_auction(cols[9].text.strip()),
-                    "blend_avg": parse_auction(cols[10].text.strip()),
-                }
-                players.append(player)
-        return players
+class Column:
+    def __init__(self, index, fields, read, convert):
+        self.index = index
+        self.fields = fields if isinstance(fields, tuple) else (fields,)
+        self.read = read
+        self.convert = convert
 
-    finally:
-        driver.quit()
+
+def stat_columns(start):
+    # 3PM, PTS, REB, AST, STL, BLK, TO and the total, in table order
+    fields = ["3pm", "pts", "reb", "ast", "stl", "blk", "to", "total"]
+    return [
+        Column(start + i, field, read_span, float) for i, field in enumerate(fields)
+    ]
+
+
+def shooting_columns(start):
+    return [
+        Column(start, ("fgm", "fga"), read_float_end_span, parse_fraction),
+        Column(start + 1, ("ftm", "fta"), read_float_end_span, parse_fraction),
+    ]
+
+
+PROJECTIONS_SCHEMA = [
+    Column(0, "rank", read_own_text, int),
+    Column(1, "adp", read_text, parse_adp),
+    Column(2, "name", read_text, str),
+    Column(3, "positions", read_text, parse_position),
+    Column(4, "team", read_text, fix_abbreviations),
+    Column(5, "gp", read_text, float),
+    Column(6, "mpg", read_text, float),
+    *shooting_columns(7),
+    *stat_columns(9),
+]
+
+PAST_YEAR_SCHEMA = [
+    Column(0, "rank", read_text, int),
+    Column(1, "name", read_text, str),
+    Column(2, "positions", read_text, parse_position),
+    Column(3, "team", read_text, fix_abbreviations),
+    Column(4, "gp", read_text, float),
+    Column(5, "mpg", read_text, float),
+    *shooting_columns(6),
+    *stat_columns(8),
+]
+
+AUCTION_SCHEMA = [
+    Column(1, "name", read_text, str),
+    Column(7, "valued_at", read_text, parse_auction),
+    Column(8, "yahoo_avg", read_text, parse_auction),
+    Column(9, "espn_avg", read_text, parse_auction),
+    Column(10, "blend_avg", read_text, parse_auction),
+]
+
+
+def iter_table_rows(page_source):
+    # The stats table repeats its header row every few rows; skip those.
+    # Plain etree elements are used, lxml.html's element classes are slower.
+    document = etree.fromstring(page_source, _html_parser)
+    tables = _stats_table(document) if document is not None else []
+    if not tables:
+        return
+    for row in tables[0].iterfind(".//tr"):
+        cells = row.findall("td")
+        if not cells or read_text(cells[0]) == "R#":
+            continue
+        yield cells
+
+
+def iter_players(page_source, schema):
+    for cells in iter_table_rows(page_source):
+        player = {}
+        for column in schema:
+            value = column.convert(column.read(cells[column.index]))
+            if len(column.fields) == 1:
+                player[column.fields[0]] = value
+            else:
+                player.update(zip(column.fields, value))
+        yield player
+
+
+def parse_projections(page_source):
+    return list(iter_players(page_source, PROJECTIONS_SCHEMA))
+
+
+def parse_past_year_stats(page_source):
+    return list(iter_players(page_source, PAST_YEAR_SCHEMA))
+
+
+def parse_auction_data(page_source):
+    return list(iter_players(page_source, AUCTION_SCHEMA))
+
+
+"""
+========================================
+Scrapers
+========================================
+"""
+
+
+def scrape_projections(session=None):
+    html = fetch_page(PROJECTIONS_URL, [SHOW_ALL, ESPN_POSITIONS], session)
+    logger.info("Parsing projections HTML")
+    return parse_projections(html)
+
+
+def scrape_past_year_stats(session=None):
+    html = fetch_page(RANKINGS_URL, [SHOW_ALL, PAST_YEAR, ESPN_POSITIONS], session)
+    logger.info("Parsing rankings HTML")
+    return parse_past_year_stats(html)
+
+
+def scrape_auction_data(session=None):
+    html = fetch_page(AUCTION_URL, [SHOW_ALL], session)
+    logger.info("Parsing auction HTML")
+    return parse_auction_data(html)
@@ -1,153 +1,239 @@
+import hashlib
 import json
 import logging
 import sys
-import unidecode
+from concurrent.futures import ThreadPoolExecutor
 from models import Player, PlayerStats, PlayerInjury, PlayerDraft
-from data import (
-    calc_categories,
+from utils.names import NameIndex
+from utils import season_db
+from utils.stages import StageTimer
+from utils.storage import read_season, write_pipeline_metrics, write_season
+from data.calc_categories import StatsTable, calc_categories
+from data.get_espn_data import get_rosters
+from data.get_hashtag_data import (
     scrape_projections,
     scrape_past_year_stats,
     scrape_auction_data,
-    get_rosters,
 )
 
-
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
-name_exceptions = [
-    ("Kenyon Martin Jr.", "KJ Martin"),
-    ("Xavier Tillman Sr.", "Xavier Tillman"),
-    ("Nicolas Claxton", "Nic Claxton"),
-    ("Alexandre Sarr", "Alex Sarr"),
-    ("Carlton Carrington", "Bub Carrington"),
-    ("Joe Harris", "SKIP"),
-    ("Dennis Smith Jr.", "SKIP"),
-    ("Boogie Ellis", "SKIP"),
-]
-
-category_keys = [
-    "fgm",
-    "fga",
-    "ftm",
-    "fta",
-    "tpm",
-    "pts",
-    "reb",
-    "ast",
-    "stl",
-    "blk",
-    "to",
-    "fg_impact",
-    "ft_impact",
-]
-
 proj_year_key = "2024"
 past_year_key = "2023"
 
+# Bump when the way players are built changes, so stored players are rebuilt
+fingerprint_version = 1
 
-def main():
-    year_key = proj_year_key
-    n = len(sys.argv)
-    if n == 2:
-        if sys.argv[1] not in [proj_year_key, past_year_key]:
-            logger.error("Invalid year key.")
-            return
-        year_key = sys.argv[1]
 
-    logger.info("=== Getting ESPN Roster Data ===")
-    players_roster_data = get_rosters()  # ESPN Roster Data
+def fingerprint(roster_data, hashtag_data, auction_data):
+    sources = [fingerprint_version, roster_data, hashtag_data, auction_data]
+    encoded = json.dumps(sources, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
 
-    players_hashtag = []
-    players_auction_data = []
-    if year_key == proj_year_key:
-        logger.info("=== Getting Hashtag Projections Data ===")
-        players_hashtag = scrape_projections()  # Hashtag Projections
 
-        logger.info("=== Getting Hashtag Auction Data ===")
-        players_auction_data = scrape_auction_data()  # Hashtag Auction Data
+def build_player(player, roster_data, auction_data, year_key):
+    # player is a Hashtag row, roster_data and auction_data the matched records
+    return Player(
+        id=roster_data["id"],
+        first_name=roster_data["first_name"],
+        last_name=roster_data["last_name"],
+        positions=player["positions"],
+        team_id=roster_data["team_id"],
+        team=roster_data["team"],
+        age=(
+            (
+                roster_data["age"]
+                if year_key == proj_year_key
+                else roster_data["age"] - 1
+            )
+            if "age" in roster_data
+            else None
+        ),
+        headshot=roster_data["headshot"],
+        years_pro=roster_data["years_pro"],
+        jersey=roster_data["jersey"] if "jersey" in roster_data else None,
+        height=roster_data["height"] if "height" in roster_data else None,
+        weight=roster_data["weight"] if "weight" in roster_data else None,
+        injuries=(
+            [
+                PlayerInjury(
+                    id=int(injury["id"]),
+                    long_comment=injury["long_comment"],
+                    short_comment=injury["short_comment"],
+                    status=injury["status"],
+                    date=injury["date"],
+                    details=injury["details"],
+                )
+                for injury in roster_data.get("injuries", [])
+            ]
+            if year_key == proj_year_key
+            else []
+        ),
+        draft=(
+            PlayerDraft(
+                year=roster_data["draft"]["year"],
+                round=roster_data["draft"]["round"],
+                selection=roster_data["draft"]["selection"],
+            )
+            if year_key == proj_year_key and roster_data["draft"] is not None
+            else None
+        ),
+        rank=player["rank"],
+        adp=player["adp"] if "adp" in player else None,
+        stats=PlayerStats(
+            gp=player["gp"],
+            mpg=player["mpg"],
+            fgm=player["fgm"],
+            fga=player["fga"],
+            ftm=player["ftm"],
+            fta=player["fta"],
+            tpm=player["3pm"],
+            pts=player["pts"],
+            reb=player["reb"],
+            ast=player["ast"],
+            stl=player["stl"],
+            blk=player["blk"],
+            to=player["to"],
+        ),
+        auction_hashtag=auction_data["valued_at"] if auction_data else None,
+        auction_yahoo_avg=auction_data["yahoo_avg"] if auction_data else None,
+        auction_espn_avg=auction_data["espn_avg"] if auction_data else None,
+        auction_blend_avg=auction_data["blend_avg"] if auction_data else None,
+    )
 
-    else:
-        logger.info("=== Getting Hashtag Past Year Data ===")
-        players_hashtag = scrape_past_year_stats()  # Hashtag Past Year Stats
+
+class Fetchers:
+    """
+    The pipeline's upstream sources. Any of them can be swapped out, e.g.
+    for fakes in tests or for cached sources in the server's scheduler.
+    """
+
+    def __init__(
+        self, rosters=None, projections=None, past_year_stats=None, auction=None
+    ):
+        self.rosters = rosters or get_rosters
+        self.projections = projections or scrape_projections
+        self.past_year_stats = past_year_stats or scrape_past_year_stats
+        self.auction = auction or scrape_auction_data
+
+
+def refresh(year_key, full_refresh, timer, fetchers=None):
+    """Rebuild one season; returns "updated" or "unchanged"."""
+    fetchers = fetchers or Fetchers()
+    # The ESPN and Hashtag sources are independent, so fetch them concurrently
+    logger.info("=== Getting ESPN Roster and Hashtag Data ===")
+    with timer.stage("fetch"), ThreadPoolExecutor(max_workers=3) as executor:
+        # ESPN Roster Data
+        roster_future = executor.submit(timer.timed("roster_fetch", fetchers.rosters))
+        if year_key == proj_year_key:
+            # Hashtag Projections and Auction Data
+            hashtag_future = executor.submit(
+                timer.timed("hashtag_scrape", fetchers.projections)
+            )
+            auction_future = executor.submit(
+                timer.timed("auction_scrape", fetchers.auction)
+            )
+        else:
+            # Hashtag Past Year Stats
+            hashtag_future = executor.submit(
+                timer.timed("hashtag_scrape", fetchers.past_year_stats)
+            )
+            auction_future = None
+
+        players_roster_data = roster_future.result()
+        players_hashtag = hashtag_future.result()
+        players_auction_data = auction_future.result() if auction_future else []
+
+    with timer.stage("merge"):
+        players, fingerprints, previous_fingerprints = merge_players(
+            year_key,
+            full_refresh,
+            players_roster_data,
+            players_hashtag,
+            players_auction_data,
+        )
+
+    if fingerprints == previous_fingerprints:
+        logger.info("=== No upstream changes, nothing to write ===")
+        return "unchanged"
+    rebuilt = sum(
+        previous_fingerprints.get(key) != value for key, value in fingerprints.items()
+    )
+    logger.info(f"=== Rebuilt {rebuilt} of {len(fingerprints)} players ===")
 
     """
     ========================================
-    Helper Functions
+    Calculate means and stds for each category, for both totals and per game stats
     ========================================
     """
-
-    def get_roster_data(player):
-        name = unidecode.unidecode(player["name"])
-        roster_data = next(
-            (
-                player
-                for player in players_roster_data
-                if player["display_name"] == name
-            ),
-            None,
+    # Impacts are relative to the league average, so any change moves them all
+    with timer.stage("calc_categories"):
+        table = StatsTable.from_players(players)
+        (
+            category_stats_totals,
+            category_stats_per,
+            fg_impacts,
+            ft_impacts,
+        ) = calc_categories(table)
+        for player, fg_impact, ft_impact in zip(players, fg_impacts, ft_impacts):
+            player.stats.fg_impact = fg_impact
+            player.stats.ft_impact = ft_impact
+
+    # The shard goes last: its fingerprints mark the season as written, so a
+    # failed database write is retried by the next run instead of skipped
+    with timer.stage("db_write"):
+        season_db.write_season(
+            year_key, players, category_stats_totals, category_stats_per
         )
-        if not roster_data:
-            if name in [exception[0] for exception in name_exceptions]:
-                new_name = next(
-                    exception[1]
-                    for exception in name_exceptions
-                    if exception[0] == name
-                )
-                if new_name == "SKIP":
-                    logger.info(f"  -   Manually skipping player: {name}")
-                    return None
-
-                else:
-                    roster_data = next(
-                        (
-                            player
-                            for player in players_roster_data
-                            if player["display_name"] == new_name
-                        ),
-                        None,
-                    )
-            else:
-                logger.info(f"  -   Could not find roster data for player: {name}")
-                return None
-        return roster_data
-
-    def get_auction_data(player):
-        if len(players_auction_data) == 0:
-            return None
-        curr_name = player["name"]
-        auction_data = next(
-            (player for player in players_auction_data if player["name"] == curr_name),
-            None,
+
+    logger.info(f"=== Writing to data/seasons/{year_key}.json ===")
+
+    with timer.stage("write"):
+        write_season(
+            year_key,
+            players,
+            category_stats_totals,
+            category_stats_per,
+            fingerprints=fingerprints,
         )
-        return auction_data
+    return "updated"
+
+
+def merge_players(
+    year_key, full_refresh, players_roster_data, players_hashtag, players_auction_data
+):
+    """
+    ========================================
+    Name Indexes
+    ========================================
+    """
+    roster_index = NameIndex(players_roster_data, key="display_name")
+    auction_index = NameIndex(players_auction_data, key="name", exceptions={})
 
     """
     ========================================
-    Data Processing
+    Previous run, for incremental refreshes
     ========================================
     """
-    # Sums for calculating means
-    category_sums_totals = [0] * 11
-    category_sums_per = [0] * 11
-
-    # Min and Max for each category
-    category_stats_totals = {}
-    category_stats_per = {}
-
-    for key in category_keys:
-        category_stats_totals[key] = {
-            "min": float("inf"),
-            "max": float("-inf"),
-        }
-        category_stats_per[key] = {
-            "min": float("inf"),
-            "max": float("-inf"),
-        }
+    previous_players, previous_fingerprints = {}, {}
+    if not full_refresh:
+        try:
+            previous = read_season(year_key)
+            previous_players = {p["id"]: p for p in previous["players"]}
+            previous_fingerprints = previous.get("fingerprints", {})
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            # Truncated or corrupt shard (orjson's JSONDecodeError is a
+            # ValueError): nothing in it can be trusted, rebuild every player
+            logger.error(f"Could not read previous {year_key} season ({e}), rebuilding")
+            previous_players, previous_fingerprints = {}, {}
 
     players = []
+    fingerprints = {}
 
     """
     ========================================
@@ -155,193 +241,50 @@ def main():
     ========================================
     """
     for player in players_hashtag:
-        roster_data = get_roster_data(player)
+        roster_data = roster_index.resolve(player["name"])
         if not roster_data:
             continue
-        auction_data = get_auction_data(player)
-
-        player = Player(
-            id=roster_data["id"],
-            first_name=roster_data["first_name"],
-            last_name=roster_data["last_name"],
-            positions=player["positions"],
-            team_id=roster_data["team_id"],
-            team=roster_data["team"],
-            age=(
-                (
-                    roster_data["age"]
-                    if year_key == proj_year_key
-                    else roster_data["age"] - 1
-                )
-                if "age" in roster_data
-                else None
-            ),
-            headshot=roster_data["headshot"],
-            years_pro=roster_data["years_pro"],
-            jersey=roster_data["jersey"] if "jersey" in roster_data else None,
-            height=roster_data["height"] if "height" in roster_data else None,
-            weight=roster_data["weight"] if "weight" in roster_data else None,
-            injuries=(
-                [
-                    PlayerInjury(
-                        id=int(injury["id"]),
-                        long_comment=injury["long_comment"],
-                        short_comment=injury["short_comment"],
-                        status=injury["status"],
-                        date=injury["date"],
-                        details=injury["details"],
-                    )
-                    for injury in roster_data.get("injuries", [])
-                ]
-                if year_key == proj_year_key
-                else []
-            ),
-            draft=(
-                PlayerDraft(
-                    year=roster_data["draft"]["year"],
-                    round=roster_data["draft"]["round"],
-                    selection=roster_data["draft"]["selection"],
-                )
-                if year_key == proj_year_key and roster_data["draft"] is not None
-                else None
-            ),
-            rank=player["rank"],
-            adp=player["adp"] if "adp" in player else None,
-            stats=PlayerStats(
-                gp=player["gp"],
-                mpg=player["mpg"],
-                fgm=player["fgm"],
-                fga=player["fga"],
-                ftm=player["ftm"],
-                fta=player["fta"],
-                tpm=player["3pm"],
-                pts=player["pts"],
-                reb=player["reb"],
-                ast=player["ast"],
-                stl=player["stl"],
-                blk=player["blk"],
-                to=player["to"],
-            ),
-            auction_hashtag=auction_data["valued_at"] if auction_data else None,
-            auction_yahoo_avg=auction_data["yahoo_avg"] if auction_data else None,
-            auction_espn_avg=auction_data["espn_avg"] if auction_data else None,
-            auction_blend_avg=auction_data["blend_avg"] if auction_data else None,
-        )
+        auction_data = auction_index.resolve(player["name"]) if auction_index else None
+
+        # Players whose source records did not change are reused as stored
+        player_key = str(roster_data["id"])
+        fingerprints[player_key] = fingerprint(roster_data, player, auction_data)
+        if (
+            roster_data["id"] in previous_players
+            and previous_fingerprints.get(player_key) == fingerprints[player_key]
+        ):
+            players.append(Player.from_dict(previous_players[roster_data["id"]]))
+            continue
 
-        # Update sums, sums of squares, and min/max for each category
-        for i, key in enumerate(category_keys):
-            if key == "fg_impact" or key == "ft_impact":
-                continue
-            category_sums_totals[i] += getattr(player.stats, key) * player.stats.gp
-            category_stats_totals[key]["min"] = min(
-                category_stats_totals[key]["min"],
-                getattr(player.stats, key) * player.stats.gp,
-            )
-            category_stats_totals[key]["max"] = max(
-                category_stats_totals[key]["max"],
-                getattr(player.stats, key) * player.stats.gp,
-            )
-            category_sums_per[i] += getattr(player.stats, key)
-            category_stats_per[key]["min"] = min(
-                category_stats_per[key]["min"], getattr(player.stats, key)
-            )
-            category_stats_per[key]["max"] = max(
-                category_stats_per[key]["max"], getattr(player.stats, key)
-            )
+        players.append(build_player(player, roster_data, auction_data, year_key))
 
-        players.append(player)
+    roster_index.log_summary(logger, "roster")
+    auction_index.log_summary(logger, "auction")
+    return players, fingerprints, previous_fingerprints
 
-    """
-    ========================================
-    Calculate means and stds for each category, for both totals and per game stats
-    ========================================
-    """
-    (
-        category_means,
-        fg_impact_mean,
-        min_fg_impact,
-        max_fg_impact,
-        ft_impact_mean,
-        min_ft_impact,
-        max_ft_impact,
-    ) = calc_categories(
-        players,
-        category_sums_totals,
-        category_sums_totals[0] / category_sums_totals[1],
-        category_sums_totals[2] / category_sums_totals[3],
-        True,
-    )
-    category_stats_totals["fg_impact"]["mean"] = fg_impact_mean
-    category_stats_totals["fg_impact"]["min"] = min_fg_impact
-    category_stats_totals["fg_impact"]["max"] = max_fg_impact
-    category_stats_totals["ft_impact"]["mean"] = ft_impact_mean
-    category_stats_totals["ft_impact"]["min"] = min_ft_impact
-    category_stats_totals["ft_impact"]["max"] = max_ft_impact
-
-    (
-        category_means_per,
-        fg_impact_mean_per,
-        min_fg_impact_per,
-        max_fg_impact_per,
-        ft_impact_mean_per,
-        min_ft_impact_per,
-        max_ft_impact_per,
-    ) = calc_categories(
-        players,
-        category_sums_per,
-        category_sums_per[0] / category_sums_per[1],
-        category_sums_per[2] / category_sums_per[3],
-        False,
-    )
-    category_stats_per["fg_impact"]["mean"] = fg_impact_mean_per
-    category_stats_per["fg_impact"]["min"] = min_fg_impact_per
-    category_stats_per["fg_impact"]["max"] = max_fg_impact_per
-    category_stats_per["ft_impact"]["mean"] = ft_impact_mean_per
-    category_stats_per["ft_impact"]["min"] = min_ft_impact_per
-    category_stats_per["ft_impact"]["max"] = max_ft_impact_per
-
-    # Update means
-    for category, mean in zip(category_keys, category_means):
-        category_stats_totals[category]["mean"] = mean
-    for category, mean in zip(category_keys, category_means_per):
-        category_stats_per[category]["mean"] = mean
-
-    # Calculate stds
-    category_stds_totals = [0] * 13
-    category_stds_per = [0] * 13
-
-    for player in players:
-        for i, key in enumerate(category_keys):
-            gp = player.stats.gp
-            category_stds_totals[i] += (
-                getattr(player.stats, key) * gp - category_stats_totals[key]["mean"]
-            ) ** 2
-            category_stds_per[i] += (
-                getattr(player.stats, key) - category_stats_per[key]["mean"]
-            ) ** 2
-
-    category_stds_totals = [((s / len(players)) ** 0.5) for s in category_stds_totals]
-    category_stds_per = [((s / len(players)) ** 0.5) for s in category_stds_per]
-
-    # Update stds
-    for category, std in zip(category_keys, category_stds_totals):
-        category_stats_totals[category]["std"] = std
-
-    logger.info("=== Writing to data/players.json ===")
-
-    players_data = [player.__dict__ for player in players]
-    for player in players_data:
-        player["stats"] = player["stats"].__dict__
-        player["draft"] = player["draft"].__dict__ if player["draft"] else None
-        player["injuries"] = [injury.__dict__ for injury in player["injuries"]]
-
-    json_data = json.load(open("data/players.json"))
-    json_data[year_key] = players_data
-    json_data[year_key + "_category_stats_totals"] = category_stats_totals
-    json_data[year_key + "_category_stats_per"] = category_stats_per
-
-    with open("data/players.json", "w") as json_file:
-        json.dump(json_data, json_file, indent=2)
+
+def main(argv=None, fetchers=None):
+    """Run the pipeline with command line style arguments; returns the status."""
+    argv = sys.argv[1:] if argv is None else argv
+    year_key = proj_year_key
+    args = [arg for arg in argv if arg != "--full"]
+    full_refresh = len(args) < len(argv)
+    if len(args) == 1:
+        if args[0] not in [proj_year_key, past_year_key]:
+            logger.error("Invalid year key.")
+            return None
+        year_key = args[0]
+
+    # Stage durations are kept for /api/metrics, failed runs included
+    timer = StageTimer()
+    status = "failed"
+    try:
+        with timer.stage("total"):
+            status = refresh(year_key, full_refresh, timer, fetchers)
+    finally:
+        timer.log(logger)
+        write_pipeline_metrics(year_key, status, timer.durations)
+    return status
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils import config
+
+
+def create_session(pool_size=config.HTTP_WORKERS, retries=config.HTTP_RETRIES):
+    # One pooled session shared by every worker; retries back off 0.5s, 1s, 2s...
+    # Only idempotent requests are retried, never e.g. a form postback
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_json(session, url, timeout=config.HTTP_TIMEOUT):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
@@ -1,3 +1,12 @@
 from .player import Player, PlayerStats, PlayerInjury, PlayerDraft
+from .serializer import camelize, dumps, loads
 
-__all__ = ["Player", "PlayerStats", "PlayerInjury", "PlayerDraft"]
+__all__ = [
+    "Player",
+    "PlayerStats",
+    "PlayerInjury",
+    "PlayerDraft",
+    "camelize",
+    "dumps",
+    "loads",
+]
@@ -1,4 +1,4 @@
-from ast import In
+from array import array
 from typing import Dict
 
 
@@ -19,22 +19,67 @@ class PlayerStats:
     blk: float
     to: float
 
-    def __init__(self, gp, mpg, fgm, fga, ftm, fta, tpm, pts, reb, ast, stl, blk, to):
-        self.gp = gp
-        self.mpg = mpg
-        self.fgm = fgm
-        self.fga = fga
-        self.fg_impact = 0
-        self.ftm = ftm
-        self.fta = fta
-        self.ft_impact = 0
-        self.tpm = tpm
-        self.pts = pts
-        self.reb = reb
-        self.ast = ast
-        self.stl = stl
-        self.blk = blk
-        self.to = to
+    # Stats live in one fixed-layout float array, in this order
+    fields = (
+        "gp",
+        "mpg",
+        "fgm",
+        "fga",
+        "fg_impact",
+        "ftm",
+        "fta",
+        "ft_impact",
+        "tpm",
+        "pts",
+        "reb",
+        "ast",
+        "stl",
+        "blk",
+        "to",
+    )
+    __slots__ = ("values",)
+
+    def __init__(
+        self,
+        gp,
+        mpg,
+        fgm,
+        fga,
+        ftm,
+        fta,
+        tpm,
+        pts,
+        reb,
+        ast,
+        stl,
+        blk,
+        to,
+        fg_impact=0,
+        ft_impact=0,
+    ):
+        self.values = array(
+            "d",
+            (gp, mpg, fgm, fga, fg_impact, ftm, fta, ft_impact)
+            + (tpm, pts, reb, ast, stl, blk, to),
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def _stat_property(index):
+    def get(self):
+        return self.values[index]
+
+    def set(self, value):
+        self.values[index] = value
+
+    return property(get, set)
+
+
+for _index, _field in enumerate(PlayerStats.fields):
+    setattr(PlayerStats, _field, _stat_property(_index))
 
 
 class PlayerInjury:
@@ -45,6 +90,9 @@ class PlayerInjury:
     date: str
     details: Dict[str, Dict[str, str] | str] | None
 
+    fields = ("id", "long_comment", "short_comment", "status", "date", "details")
+    __slots__ = fields
+
     def __init__(self, id, long_comment, short_comment, status, date, details):
         self.id = id
         self.long_comment = long_comment
@@ -53,17 +101,28 @@ class PlayerInjury:
         self.date = date
         self.details = details
 
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
 
 class PlayerDraft:
     year: int
     round: int
     selection: int
 
+    fields = ("year", "round", "selection")
+    __slots__ = fields
+
     def __init__(self, year, round, selection):
         self.year = year
         self.round = round
         self.selection = selection
 
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
 
 class Player:
     id: int  # ESPN Player ID
@@ -89,6 +148,31 @@ class Player:
     auction_espn_avg: float | None
     auction_blend_avg: float | None
 
+    fields = (
+        "id",
+        "first_name",
+        "last_name",
+        "positions",
+        "team_id",
+        "team",
+        "age",
+        "headshot",
+        "years_pro",
+        "jersey",
+        "height",
+        "weight",
+        "injuries",
+        "draft",
+        "rank",
+        "adp",
+        "stats",
+        "auction_hashtag",
+        "auction_yahoo_avg",
+        "auction_espn_avg",
+        "auction_blend_avg",
+    )
+    __slots__ = fields
+
     def __init__(
         self,
         id,
@@ -134,3 +218,17 @@ class Player:
         self.auction_yahoo_avg = auction_yahoo_avg
         self.auction_espn_avg = auction_espn_avg
         self.auction_blend_avg = auction_blend_avg
+
+    @classmethod
+    def from_dict(cls, data):
+        # Rebuilds a player stored in data/seasons/<year>.json
+        return cls(
+            **{
+                **data,
+                "injuries": [PlayerInjury.from_dict(i) for i in data["injuries"]],
+                "draft": (
+                    PlayerDraft.from_dict(data["draft"]) if data["draft"] else None
+                ),
+                "stats": PlayerStats.from_dict(data["stats"]),
+            }
+        )
@@ -0,0 +1,69 @@
+from functools import lru_cache
+
+import orjson
+
+from .player import Player, PlayerDraft, PlayerInjury, PlayerStats
+
+
+@lru_cache(maxsize=None)
+def to_camel_case(key):
+    # "fg_impact" -> "fgImpact"; keys without underscores are left as they are
+    head, *rest = key.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def _model_keys(model, camel):
+    if camel:
+        return tuple(to_camel_case(field) for field in model.fields)
+    return model.fields
+
+
+_keys = {
+    camel: {
+        model: _model_keys(model, camel)
+        for model in (Player, PlayerStats, PlayerInjury, PlayerDraft)
+    }
+    for camel in (False, True)
+}
+
+
+def _default(camel):
+    keys = _keys[camel]
+
+    def default(obj):
+        model = type(obj)
+        if model is PlayerStats:
+            return dict(zip(keys[model], obj.values))
+        if model in keys:
+            return dict(zip(keys[model], (getattr(obj, f) for f in model.fields)))
+        raise TypeError(f"Cannot serialize {model.__name__}")
+
+    return default
+
+
+_defaults = {camel: _default(camel) for camel in (False, True)}
+
+
+def camelize(obj):
+    # Recursively camelCases the keys of plain data (dicts and lists)
+    if isinstance(obj, dict):
+        return {to_camel_case(key): camelize(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [camelize(value) for value in obj]
+    return obj
+
+
+def dumps(obj, camel=False):
+    """
+    Encode models and plain data straight to JSON bytes.
+
+    Models are written field by field without building their __dict__
+    trees; with camel=True every key is camelCased, as the frontend uses.
+    """
+    if camel:
+        obj = camelize(obj)
+    return orjson.dumps(obj, default=_defaults[camel])
+
+
+def loads(data):
+    return orjson.loads(data)
@@ -1 +1,7 @@
-from .players import PlayersResource
+from .auction import PlayerAuctionResource
+from .history import PlayerHistoryResource
+from .matchup import PlayerMatchupResource
+from .metrics import MetricsResource
+from .players import PlayerResource, PlayersBatchResource, PlayersResource
+from .scores import PlayerScoresResource
+from .search import PlayerSearchResource
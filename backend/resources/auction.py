@@ -0,0 +1,68 @@
+from flask import jsonify, make_response, request
+from flask_restful import Resource
+
+from resources.scores import get_score_table
+from utils.auction import AuctionValues, LeagueSettings, eligibility
+from utils.dataset import players_dataset
+from utils.lru import LRUCache
+from utils.responses import cached_response, encode_json
+from utils.scores import modes, punts_from_mask
+
+# Valuations and their bodies per (year, dataset, mode, settings), so
+# re-valuing after every nomination is a cache hit
+auction_bodies = LRUCache(maxsize=256, name="auction")
+
+
+def get_eligibility(year_data, table):
+    # Rows line up with the score table's players
+    def build():
+        by_id = year_data.indexes.by_id
+        return eligibility([year_data.players[by_id[int(i)]] for i in table.ids])
+
+    return year_data.memoize(("eligibility", table.mode), build)
+
+
+def build_auction_body(year_data, mode, settings):
+    table = get_score_table(year_data, mode)
+    values = AuctionValues(table, get_eligibility(year_data, table), settings)
+    return encode_json(
+        {
+            "year": year_data.year,
+            "mode": mode,
+            "settings": {
+                "teams": settings.teams,
+                "budget": settings.budget,
+                "roster": settings.roster_size,
+                "min_bid": settings.min_bid,
+                "slots": settings.slots,
+                "punts": punts_from_mask(settings.mask),
+            },
+            "players": values.ranking(),
+        },
+        level=5,
+    )
+
+
+class PlayerAuctionResource(Resource):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get(year):
+        year_data = players_dataset.get_year(year)
+        if year_data is None:
+            return make_response(jsonify({"error": "Invalid year"}), 400)
+
+        mode = request.args.get("mode", "totals")
+        if mode not in modes:
+            return make_response(jsonify({"error": "Invalid mode"}), 400)
+        try:
+            settings = LeagueSettings.from_args(request.args)
+        except ValueError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+        body = auction_bodies.get_or_build(
+            (year, year_data.signature, mode, settings.key),
+            lambda: build_auction_body(year_data, mode, settings),
+        )
+        return cached_response(body, request)
@@ -0,0 +1,59 @@
+from flask import jsonify, make_response, request
+from flask_restful import Resource
+
+from models import camelize
+from resources.players import parse_case
+from resources.scores import get_score_table
+from utils.dataset import players_dataset
+from utils.history import PlayerHistory
+from utils.lru import LRUCache
+from utils.responses import cached_response, encode_json
+from utils.scores import modes
+
+# Keyed by the served datasets' version, so a swapped in season rebuilds it
+history_indexes = LRUCache(maxsize=1, name="history_index")
+history_bodies = LRUCache(maxsize=1024, name="history")
+
+
+def build_history():
+    seasons = []
+    for year in players_dataset.available_years():
+        year_data = players_dataset.get_year(year)
+        if year_data is not None:
+            tables = {mode: get_score_table(year_data, mode) for mode in modes}
+            seasons.append((year_data, tables))
+    return PlayerHistory(seasons)
+
+
+def get_history():
+    version = players_dataset.version()
+    return version, history_indexes.get_or_build(version, build_history)
+
+
+def warm_history():
+    get_history()
+
+
+class PlayerHistoryResource(Resource):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get(player_id):
+        try:
+            case = parse_case(request.args)
+        except ValueError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+        version, history = get_history()
+        player = history.get(player_id)
+        if player is None:
+            return make_response(jsonify({"error": "Player not found"}), 404)
+
+        body = history_bodies.get_or_build(
+            (version, player_id, case),
+            lambda: encode_json(
+                camelize(player) if case == "camel" else player, level=5
+            ),
+        )
+        return cached_response(body, request)
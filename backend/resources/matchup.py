@@ -0,0 +1,95 @@
+from flask import Response, jsonify, make_response, request
+from flask_restful import Resource
+
+from models import dumps
+from utils import config
+from utils.dataset import players_dataset
+from utils.lru import LRUCache
+from utils.matchup import simulate_matchup
+
+# Simulations are seeded, so identical requests get identical results
+matchup_results = LRUCache(maxsize=256, name="matchup")
+
+
+def parse_team(data, key):
+    ids = data.get(key)
+    if not isinstance(ids, list) or not ids:
+        raise ValueError(f"{key} must be a non-empty list of player ids")
+    if not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        raise ValueError(f"{key} must be a non-empty list of player ids")
+    if len(ids) > 30:
+        raise ValueError(f"{key} has more than 30 players")
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"{key} has duplicate player ids")
+    # Simulated in id order, so results don't depend on the order given
+    return sorted(ids)
+
+
+def parse_int(data, key, default, low, high):
+    value = data.get(key, default)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{key} must be an integer")
+    if not low <= value <= high:
+        raise ValueError(f"{key} must be between {low} and {high}")
+    return value
+
+
+class PlayerMatchupResource(Resource):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def post(year):
+        year_data = players_dataset.get_year(year)
+        if year_data is None:
+            return make_response(jsonify({"error": "Invalid year"}), 400)
+
+        data = request.get_json(silent=True)
+        try:
+            if not isinstance(data, dict):
+                raise ValueError("Expected a JSON object")
+            team_a = parse_team(data, "team_a")
+            team_b = parse_team(data, "team_b")
+            if set(team_a) & set(team_b):
+                raise ValueError("Players can't be on both teams")
+            weeks = parse_int(data, "weeks", 20000, 1, config.SIM_MAX_WEEKS)
+            games = parse_int(data, "games", 3, 1, 7)
+            seed = parse_int(data, "seed", 0, 0, 2**32 - 1)
+        except ValueError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+        by_id = year_data.indexes.by_id
+        players = year_data.players
+        missing = [
+            i
+            for i in team_a + team_b
+            if i not in by_id or players[by_id[i]]["stats"] is None
+        ]
+        if missing:
+            return make_response(
+                jsonify({"error": "Unknown players", "missing": missing}), 400
+            )
+
+        def build():
+            result = simulate_matchup(
+                [players[by_id[i]]["stats"] for i in team_a],
+                [players[by_id[i]]["stats"] for i in team_b],
+                weeks,
+                games,
+                seed,
+            )
+            return dumps(result)
+
+        body = matchup_results.get_or_build(
+            (
+                year,
+                year_data.signature,
+                tuple(team_a),
+                tuple(team_b),
+                weeks,
+                games,
+                seed,
+            ),
+            build,
+        )
+        return Response(body, status=200, mimetype="application/json")
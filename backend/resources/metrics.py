@@ -0,0 +1,47 @@
+from flask import Response
+from flask_restful import Resource
+
+from utils import config, metrics, storage
+from utils.lru import caches
+
+
+def cache_metrics():
+    hits = metrics.Counter("cache_hits_total", "Response cache hits", ("cache",))
+    misses = metrics.Counter("cache_misses_total", "Response cache misses", ("cache",))
+    size = metrics.Gauge("cache_entries", "Entries in the response cache", ("cache",))
+    for name, cache in caches.items():
+        hits.inc(name, amount=cache.hits)
+        misses.inc(name, amount=cache.misses)
+        size.set(name, value=len(cache))
+    return [hits, misses, size]
+
+
+def pipeline_metrics():
+    # Written by data/players.py, which runs in its own process
+    duration = metrics.Gauge(
+        "pipeline_stage_duration_seconds",
+        "Duration of each stage of the last players refresh",
+        ("year", "stage"),
+    )
+    finished = metrics.Gauge(
+        "pipeline_last_run_timestamp_seconds",
+        "When the last players refresh finished",
+        ("year", "status"),
+    )
+    for year, run in storage.read_pipeline_metrics()["seasons"].items():
+        finished.set(year, run["status"], value=run["finished_at"])
+        for stage, seconds in run["stages"].items():
+            duration.set(year, stage, value=seconds)
+    return [duration, finished]
+
+
+class MetricsResource(Resource):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get():
+        threads = metrics.Gauge("http_server_threads", "Request threads per worker")
+        threads.set(value=config.THREADS)
+        body = metrics.render([threads, *cache_metrics(), *pipeline_metrics()])
+        return Response(body, mimetype="text/plain; version=0.0.4")
@@ -1,9 +1,105 @@
-import json
-import os
-from flask import jsonify, make_response, request
+from flask import Response, jsonify, make_response, request
 from flask_restful import Resource
 
-available_years = ["2023", "2024"]
+from models import camelize, dumps
+from utils import config
+from utils.dataset import players_dataset
+from utils.lru import LRUCache
+from utils.query import PlayersQuery, project, sort_order
+from utils.responses import EncodedBody, cached_response, encode_json
+
+# Encoded bodies for the most requested projections and pages
+query_bodies = LRUCache(maxsize=256, name="players_query")
+
+
+def get_order(year_data, sort):
+    # Each player's place in the sorted list, to order filtered matches
+    # without walking the whole order
+    def build():
+        order = sort_order(year_data.players, sort)
+        places = [0] * len(order)
+        for place, i in enumerate(order):
+            places[i] = place
+        return order, places
+
+    return year_data.memoize(("order", sort), build)
+
+
+def select_players(year_data, query):
+    """The query's page of players and how many matched before paging."""
+    players = year_data.players
+    if query.is_filtered():
+        matched = year_data.indexes.match(query.teams, query.positions, query.healthy)
+        if query.sort:
+            order = sorted(matched, key=get_order(year_data, query.sort)[1].__getitem__)
+        else:
+            order = sorted(matched)
+    elif query.sort:
+        order = get_order(year_data, query.sort)[0]
+    else:
+        order = range(len(players))
+
+    end = None if query.limit is None else query.offset + query.limit
+    selected = [players[i] for i in order[query.offset : end]]
+    if query.fields:
+        selected = [project(player, query.fields) for player in selected]
+    return selected, len(order)
+
+
+def build_players_body(year_data, camel, players=None):
+    year = year_data.year
+    payload = {
+        f"{year}_players": year_data.players if players is None else players,
+        f"{year}_category_stats_total": year_data.category_stats_totals,
+        f"{year}_category_stats_per": year_data.category_stats_per,
+    }
+    if camel:
+        # Top-level keys stay as they are; only the records are camelCased
+        payload = {key: camelize(value) for key, value in payload.items()}
+    return encode_json(payload, level=9 if players is None else 5)
+
+
+def build_query_body(year_data, camel, query):
+    players, total = select_players(year_data, query)
+    return build_players_body(year_data, camel, players), total
+
+
+def get_fragments(year_data, case):
+    # Every player serialized once, so lookups only join bytes
+    camel = case == "camel"
+    return year_data.memoize(
+        ("fragments", case),
+        lambda: [dumps(player, camel=camel) for player in year_data.players],
+    )
+
+
+def parse_case(args):
+    case = args.get("case", "snake")
+    if case not in ("snake", "camel"):
+        raise ValueError("Invalid case")
+    return case
+
+
+def parse_ids(data):
+    # Either a list of ids or {"ids": [...]}
+    ids = data.get("ids") if isinstance(data, dict) else data
+    if not isinstance(ids, list) or not all(
+        isinstance(i, int) and not isinstance(i, bool) for i in ids
+    ):
+        raise ValueError("Expected a list of player ids")
+    if len(ids) > config.BATCH_MAX_IDS:
+        raise ValueError(f"At most {config.BATCH_MAX_IDS} ids per request")
+    return ids
+
+
+def warm_players(year_data):
+    # Full bodies and per-player fragments, in both cases
+    for case in ("snake", "camel"):
+        year_data.memoize(
+            ("body", case),
+            lambda: build_players_body(year_data, case == "camel"),
+        )
+        get_fragments(year_data, case)
 
 
 class PlayersResource(Resource):
@@ -12,23 +108,82 @@ class PlayersResource(Resource):
 
     @staticmethod
     def get(year):
-        if year not in available_years:
+        year_data = players_dataset.get_year(year)
+        if year_data is None:
+            return make_response(jsonify({"error": "Invalid year"}), 400)
+
+        try:
+            case = parse_case(request.args)
+            query = PlayersQuery.from_args(request.args)
+        except ValueError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+        camel = case == "camel"
+        if query.is_default():
+            body = year_data.memoize(
+                ("body", case), lambda: build_players_body(year_data, camel)
+            )
+            total = len(year_data.players)
+        else:
+            body, total = query_bodies.get_or_build(
+                (year, year_data.signature, case, query.key),
+                lambda: build_query_body(year_data, camel, query),
+            )
+        return cached_response(body, request, headers={"X-Total-Count": str(total)})
+
+
+class PlayerResource(Resource):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get(year, player_id):
+        year_data = players_dataset.get_year(year)
+        if year_data is None:
+            return make_response(jsonify({"error": "Invalid year"}), 400)
+        try:
+            case = parse_case(request.args)
+        except ValueError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+        i = year_data.indexes.by_id.get(player_id)
+        if i is None:
+            return make_response(jsonify({"error": "Player not found"}), 404)
+
+        body = year_data.memoize(
+            ("player", case, player_id),
+            lambda: EncodedBody(get_fragments(year_data, case)[i], level=5),
+        )
+        return cached_response(body, request)
+
+
+class PlayersBatchResource(Resource):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def post(year):
+        year_data = players_dataset.get_year(year)
+        if year_data is None:
             return make_response(jsonify({"error": "Invalid year"}), 400)
+        try:
+            case = parse_case(request.args)
+            ids = parse_ids(request.get_json(silent=True))
+        except ValueError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
 
-        dirname = os.path.dirname(__file__)
-        players_file = os.path.join(dirname, "../data/players.json")
-        with open(players_file) as f:
-            data = json.load(f)
-            players = data[year]
-            category_stats_totals = data[f"{year}_category_stats_totals"]
-            category_stats_per = data[f"{year}_category_stats_per"]
-        return make_response(
-            jsonify(
-                {
-                    f"{year}_players": players,
-                    f"{year}_category_stats_total": category_stats_totals,
-                    f"{year}_category_stats_per": category_stats_per,
-                }
-            ),
-            200,
+        # Players come back in the order requested; unknown ids are listed
+        by_id = year_data.indexes.by_id
+        fragments = get_fragments(year_data, case)
+        found = [fragments[by_id[i]] for i in ids if i in by_id]
+        missing = [i for i in ids if i not in by_id]
+        body = b"".join(
+            (
+                b'{"players":[',
+                b",".join(found),
+                b'],"missing":',
+                dumps(missing),
+                b"}",
+            )
         )
+        return Response(body, status=200, mimetype="application/json")
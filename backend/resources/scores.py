@@ -0,0 +1,57 @@
+from flask import jsonify, make_response, request
+from flask_restful import Resource
+
+from utils.dataset import players_dataset
+from utils.lru import LRUCache
+from utils.responses import cached_response, encode_json
+from utils.scores import ScoreTable, modes, parse_punts, punts_from_mask
+
+# Encoded bodies for the most requested (year, mode, punt set) combinations
+score_bodies = LRUCache(maxsize=256, name="scores")
+
+
+def get_score_table(year_data, mode):
+    return year_data.memoize(("scores", mode), lambda: ScoreTable(year_data, mode))
+
+
+def build_scores_body(table, mask):
+    return encode_json(
+        {
+            "year": table.year,
+            "mode": table.mode,
+            "punts": punts_from_mask(mask),
+            "players": table.ranking(mask),
+        },
+        level=5,
+    )
+
+
+def warm_scores(year_data):
+    for mode in modes:
+        get_score_table(year_data, mode)
+
+
+class PlayerScoresResource(Resource):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get(year):
+        year_data = players_dataset.get_year(year)
+        if year_data is None:
+            return make_response(jsonify({"error": "Invalid year"}), 400)
+
+        mode = request.args.get("mode", "totals")
+        if mode not in modes:
+            return make_response(jsonify({"error": "Invalid mode"}), 400)
+        try:
+            mask = parse_punts(request.args.get("punt"))
+        except ValueError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+        table = get_score_table(year_data, mode)
+        body = score_bodies.get_or_build(
+            (year, year_data.signature, mode, mask),
+            lambda: build_scores_body(table, mask),
+        )
+        return cached_response(body, request)
@@ -0,0 +1,51 @@
+from flask import jsonify, make_response, request
+from flask_restful import Resource
+
+from models import camelize
+from resources.players import parse_case
+from utils.dataset import players_dataset
+from utils.lru import LRUCache
+from utils.query import parse_count, project
+from utils.responses import cached_response, encode_json
+
+search_fields = ("id", "first_name", "last_name", "team", "positions", "rank")
+max_limit = 50
+
+# Encoded bodies for repeated queries, e.g. the same prefix typed again
+search_bodies = LRUCache(maxsize=1024, name="search")
+
+
+def build_search_body(year_data, query, limit, camel):
+    players = [
+        project(year_data.players[i], search_fields)
+        for i in year_data.search.search(query, limit)
+    ]
+    if camel:
+        players = camelize(players)
+    return encode_json({"query": query, "players": players}, level=5)
+
+
+class PlayerSearchResource(Resource):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get(year):
+        year_data = players_dataset.get_year(year)
+        if year_data is None:
+            return make_response(jsonify({"error": "Invalid year"}), 400)
+
+        query = request.args.get("q", "").strip()
+        try:
+            if not query:
+                raise ValueError("Missing query")
+            case = parse_case(request.args)
+            limit = min(parse_count(request.args.get("limit"), "limit", 10), max_limit)
+        except ValueError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+        body = search_bodies.get_or_build(
+            (year, year_data.signature, query, limit, case),
+            lambda: build_search_body(year_data, query, limit, case == "camel"),
+        )
+        return cached_response(body, request)
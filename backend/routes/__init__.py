@@ -1 +1,2 @@
+from .metrics import METRICS_RESOURCE
 from .players import PLAYERS_RESOURCE
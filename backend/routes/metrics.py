@@ -0,0 +1,9 @@
+from flask import Blueprint
+from flask_restful import Api
+
+from resources import MetricsResource
+
+METRICS_RESOURCE = Blueprint("metrics", __name__)
+
+api = Api(METRICS_RESOURCE)
+api.add_resource(MetricsResource, "/metrics")
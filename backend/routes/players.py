@@ -1,8 +1,25 @@
 from flask import Blueprint
 from flask_restful import Api
 
-from resources import PlayersResource
+from resources import (
+    PlayerAuctionResource,
+    PlayerHistoryResource,
+    PlayerMatchupResource,
+    PlayerResource,
+    PlayerScoresResource,
+    PlayerSearchResource,
+    PlayersBatchResource,
+    PlayersResource,
+)
 
 PLAYERS_RESOURCE = Blueprint("players", __name__)
 
-Api(PLAYERS_RESOURCE).add_resource(PlayersResource, "/players/<string:year>")
+api = Api(PLAYERS_RESOURCE)
+api.add_resource(PlayersResource, "/players/<string:year>")
+api.add_resource(PlayerHistoryResource, "/players/history/<int:player_id>")
+api.add_resource(PlayerScoresResource, "/players/<string:year>/scores")
+api.add_resource(PlayerAuctionResource, "/players/<string:year>/auction")
+api.add_resource(PlayerMatchupResource, "/players/<string:year>/matchup")
+api.add_resource(PlayerSearchResource, "/players/<string:year>/search")
+api.add_resource(PlayerResource, "/players/<string:year>/<int:player_id>")
+api.add_resource(PlayersBatchResource, "/players/<string:year>/batch")
@@ -0,0 +1,33 @@
+import shutil
+
+import pytest
+
+from utils import storage
+from utils.dataset import players_dataset
+
+
+@pytest.fixture
+def seasons_dir(tmp_path):
+    """A copy of the stored seasons, with an empty SQLite store next to it."""
+    path = tmp_path / "seasons"
+    shutil.copytree(storage.SEASONS_DIR, path)
+    return str(path)
+
+
+@pytest.fixture
+def dataset(seasons_dir, tmp_path, monkeypatch):
+    """The served DatasetCache, pointed at the copied seasons."""
+    monkeypatch.setattr(players_dataset, "seasons_dir", seasons_dir)
+    monkeypatch.setattr(players_dataset, "db_path", str(tmp_path / "seasons.db"))
+    monkeypatch.setattr(players_dataset, "_years", {})
+    monkeypatch.setattr(players_dataset, "_manifest", (None, []))
+    monkeypatch.setattr(players_dataset, "_database", (None, []))
+    monkeypatch.setattr(players_dataset, "auto_reload", True)
+    return players_dataset
+
+
+@pytest.fixture
+def client():
+    from app import app
+
+    return app.test_client()
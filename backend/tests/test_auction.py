@@ -0,0 +1,45 @@
+import numpy as np
+
+from utils.auction import AuctionValues, LeagueSettings, eligibility, parse_slots
+from utils.scores import z_weights
+
+
+class Table:
+    """Score table whose players are worth `values`, all from points."""
+
+    def __init__(self, values):
+        self.ids = np.arange(len(values))
+        self.z_scores = np.zeros((len(values), len(z_weights)))
+        self.z_scores[:, 3] = values
+
+
+# Six guards and two centers, best first within each position
+players = [{"positions": ["PG"]}] * 6 + [{"positions": ["C"]}] * 2
+values = [10.0, 9.0, 8.0, 7.0, 6.0, 5.0, 3.0, 1.0]
+
+
+def auction(slots):
+    settings = LeagueSettings(teams=2, roster_size=3, slots=parse_slots(slots))
+    return AuctionValues(Table(values), eligibility(players), settings)
+
+
+def test_slots_set_replacement_levels():
+    two_centers = auction("PG:1,C:2")
+    # Every team starts two centers, so both are drafted and the fifth and
+    # sixth guards are left
+    assert two_centers.replacement.tolist() == [6.0] * 6 + [1.0] * 2
+    assert two_centers.dollars[6] > 1
+    assert two_centers.dollars[4] == two_centers.dollars[5] == 0
+
+    no_center = auction("PG:1")
+    # Without center slots the guards fill the roster spots
+    assert no_center.replacement.tolist() == [5.0] * 6 + [3.0] * 2
+    assert no_center.dollars[6] == no_center.dollars[7] == 0
+    assert no_center.dollars[4] > 1
+
+
+def test_budget_is_spent_on_the_pool():
+    result = auction("PG:1,C:2")
+
+    assert np.count_nonzero(result.dollars) == 6
+    assert result.dollars.sum() == 2 * 200
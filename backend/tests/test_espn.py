@@ -0,0 +1,151 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from data import get_espn_data
+from data.sessions import create_session
+
+TEAMS = {
+    "sports": [
+        {
+            "leagues": [
+                {
+                    "teams": [
+                        {"team": {"id": "7", "abbreviation": "DEN"}},
+                        {"team": {"id": "21", "abbreviation": "PHX"}},
+                    ]
+                }
+            ]
+        }
+    ]
+}
+
+ROSTERS = {
+    "7": [
+        {
+            "id": "3112335",
+            "firstName": "Nikola",
+            "lastName": "Jokic",
+            "displayName": "Nikola Jokic",
+            "age": 29,
+            "experience": {"years": 9},
+            "jersey": "15",
+            "injuries": [
+                {"id": "1", "status": "Day-To-Day", "date": "2024-10-01T00:00Z"}
+            ],
+            "draft": {"year": 2014, "round": 2, "selection": 41},
+        },
+        # No experience: logged and skipped
+        {"id": "1", "firstName": "Bad", "lastName": "Row", "displayName": "Bad"},
+    ],
+    "21": [
+        {
+            "id": "3202",
+            "firstName": "Kevin",
+            "lastName": "Durant",
+            "displayName": "Kevin Durant",
+            "experience": {"years": 16},
+            "headshot": {"href": "https://example.com/3202.png"},
+        }
+    ],
+}
+
+
+class StubESPN(BaseHTTPRequestHandler):
+    """The two ESPN endpoints get_rosters reads, failing on request."""
+
+    failures = {}  # path -> responses to fail with 503 before succeeding
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path))
+        if self.failures.get(self.path, 0) > 0:
+            self.failures[self.path] -= 1
+            return self.reply(503, {})
+        if self.path == "/teams":
+            return self.reply(200, TEAMS)
+        team_id = self.path.removeprefix("/teams/").removesuffix("?enable=roster")
+        if team_id in ROSTERS:
+            return self.reply(200, {"team": {"athletes": ROSTERS[team_id]}})
+        self.reply(404, {})
+
+    def do_POST(self):
+        self.requests.append(("POST", self.path))
+        self.reply(503, {})
+
+    def reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def espn_url(monkeypatch):
+    monkeypatch.setattr(StubESPN, "failures", {})
+    monkeypatch.setattr(StubESPN, "requests", [])
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubESPN)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_rosters(espn_url):
+    players = get_espn_data.get_rosters(espn_url, max_workers=2)
+
+    assert [(p["id"], p["team_id"], p["team"]) for p in players] == [
+        (3112335, 7, "DEN"),
+        (3202, 21, "PHX"),
+    ]
+    jokic, durant = players
+    assert jokic["jersey"] == 15
+    assert jokic["headshot"] == get_espn_data.NO_HEADSHOT_URL
+    assert jokic["injuries"][0]["status"] == "Day-To-Day"
+    assert jokic["injuries"][0]["long_comment"] is None
+    assert jokic["draft"] == {"year": 2014, "round": 2, "selection": 41}
+    assert durant["age"] is None
+    assert durant["draft"] is None
+
+
+def test_get_rosters_retries_failed_requests(espn_url):
+    StubESPN.failures = {"/teams": 1, "/teams/21?enable=roster": 2}
+
+    players = get_espn_data.get_rosters(espn_url, max_workers=2)
+
+    assert len(players) == 2
+    assert StubESPN.requests.count(("GET", "/teams")) == 2
+    assert StubESPN.requests.count(("GET", "/teams/21?enable=roster")) == 3
+
+
+def test_get_rosters_closes_its_session(espn_url, monkeypatch):
+    closed = []
+    close = requests.Session.close
+    monkeypatch.setattr(
+        requests.Session, "close", lambda self: closed.append(self) or close(self)
+    )
+
+    get_espn_data.get_rosters(espn_url, max_workers=2)
+    assert len(closed) == 1
+
+    # A session passed in is left to the caller
+    session = create_session(pool_size=2)
+    get_espn_data.get_rosters(espn_url, session=session, max_workers=2)
+    assert session not in closed
+
+
+def test_posts_are_not_retried(espn_url):
+    with create_session(retries=3) as session:
+        response = session.post(f"{espn_url}/teams")
+
+    assert response.status_code == 503
+    assert StubESPN.requests == [("POST", "/teams")]
@@ -0,0 +1,172 @@
+import os
+
+import pytest
+
+from data import get_hashtag_data as hashtag
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "hashtag")
+
+
+def fixture(name):
+    # Saved as served over HTTP: the tables have no <tbody>
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Serves `get_page` to the GET and `post_page` to every postback."""
+
+    def __init__(self, get_page, post_page):
+        self.headers = {}
+        self.get_page = get_page
+        self.post_page = post_page
+        self.sent_headers = []
+        self.posts = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+    def get(self, url, headers, timeout):
+        self.sent_headers.append(headers)
+        return FakeResponse(self.get_page)
+
+    def post(self, url, data, headers, timeout):
+        self.sent_headers.append(headers)
+        self.posts.append((url, data))
+        return FakeResponse(self.post_page)
+
+
+def test_parse_projections():
+    players = hashtag.parse_projections(fixture("projections.html"))
+
+    # Header rows, including the repeated one, are skipped
+    assert [player["name"] for player in players] == [
+        "Nikola Jokic",
+        "Kevin Durant",
+        "Jordan Clarkson",
+    ]
+    jokic, durant, clarkson = players
+    assert jokic["rank"] == 1
+    assert jokic["adp"] == 1.4
+    assert (jokic["fgm"], jokic["fga"]) == (10.4, 17.9)
+    assert (jokic["ftm"], jokic["fta"]) == (4.8, 5.9)
+    assert jokic["pts"] == 26.4
+    assert jokic["to"] == 3.0
+    assert jokic["total"] == 15.22
+    assert durant["adp"] == 140.0
+    assert durant["positions"] == ["SF", "PF"]
+    assert durant["team"] == "PHX"
+    assert clarkson["positions"] == ["PG", "SG"]
+    assert clarkson["team"] == "UTAH"
+    assert clarkson["total"] == -0.4
+
+
+def test_parse_past_year_stats():
+    players = hashtag.parse_past_year_stats(fixture("past_year.html"))
+
+    assert [(player["rank"], player["name"]) for player in players] == [
+        (1, "Nikola Jokic"),
+        (2, "Deni Avdija"),
+    ]
+    assert players[1]["team"] == "WSH"
+    assert players[1]["mpg"] == 30.1
+    assert (players[1]["fgm"], players[1]["fga"]) == (5.6, 11.1)
+
+
+def test_parse_auction_data():
+    players = hashtag.parse_auction_data(fixture("auction.html"))
+
+    assert players == [
+        {
+            "name": "Nikola Jokic",
+            "valued_at": 61.7,
+            "yahoo_avg": 63.0,
+            "espn_avg": 59.5,
+            "blend_avg": 61.2,
+        },
+        {
+            "name": "Bench Guard",
+            "valued_at": 0.0,
+            "yahoo_avg": 1.0,
+            "espn_avg": 0.0,
+            "blend_avg": 0.5,
+        },
+    ]
+
+
+def test_parse_page_without_table():
+    assert hashtag.parse_projections("<html><body></body></html>") == []
+
+
+def test_fetch_page_http_replays_postbacks():
+    session = FakeSession(
+        fixture("projections_initial.html"), fixture("projections.html")
+    )
+
+    html = hashtag.fetch_page_http(
+        hashtag.PROJECTIONS_URL, [hashtag.SHOW_ALL, hashtag.ESPN_POSITIONS], session
+    )
+
+    assert len(hashtag.parse_projections(html)) == 3
+    # The User-Agent goes with every request, not onto the caller's session
+    assert session.headers == {}
+    assert [h["User-Agent"] for h in session.sent_headers] == [hashtag.USER_AGENT] * 3
+    (show_url, show), (positions_url, positions) = session.posts
+    assert show_url == positions_url == hashtag.PROJECTIONS_URL
+    # The form state is sent back with the chosen value of each dropdown
+    assert show["__VIEWSTATE"] == "dDwtMTI3OTMzNDM4NDs7Pg=="
+    assert show["__EVENTVALIDATION"] == "/wEdAAeV2x9aVQ=="
+    assert show["__EVENTTARGET"] == hashtag.DDSHOW
+    assert show[hashtag.DDSHOW] == "900"
+    assert show[hashtag.DDPOSFROM] == "1"
+    assert positions["__EVENTTARGET"] == hashtag.DDPOSFROM
+    assert positions[hashtag.DDSHOW] == "900"
+    assert positions[hashtag.DDPOSFROM] == "2"
+
+
+def test_fetch_page_http_without_form():
+    session = FakeSession("<html><body></body></html>", "")
+
+    with pytest.raises(hashtag.ScrapeError):
+        hashtag.fetch_page_http(hashtag.PROJECTIONS_URL, [hashtag.SHOW_ALL], session)
+
+
+def test_fetch_page_falls_back_to_selenium(monkeypatch):
+    session = FakeSession("<html><body></body></html>", "")
+    fallback = []
+
+    def fetch_page_selenium(url, steps):
+        fallback.append((url, steps))
+        return fixture("projections.html")
+
+    monkeypatch.setattr(hashtag, "fetch_page_selenium", fetch_page_selenium)
+
+    html = hashtag.fetch_page(hashtag.AUCTION_URL, [hashtag.SHOW_ALL], session)
+
+    assert html == fixture("projections.html")
+    assert fallback == [(hashtag.AUCTION_URL, [hashtag.SHOW_ALL])]
+
+
+def test_fetch_page_http_closes_its_session(monkeypatch):
+    session = FakeSession(fixture("projections.html"), fixture("projections.html"))
+    monkeypatch.setattr(hashtag, "create_session", lambda pool_size: session)
+
+    hashtag.fetch_page_http(hashtag.PROJECTIONS_URL, [])
+    assert session.closed
+
+    # A session passed in is left to the caller
+    session = FakeSession(fixture("projections.html"), fixture("projections.html"))
+    hashtag.fetch_page_http(hashtag.PROJECTIONS_URL, [], session)
+    assert not session.closed
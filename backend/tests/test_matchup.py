@@ -0,0 +1,72 @@
+import pytest
+
+from resources import matchup as matchup_resource
+from utils import config, matchup
+from utils.lru import LRUCache
+
+
+@pytest.fixture
+def ids(dataset):
+    year_data = dataset.get_year("2024")
+    return [player["id"] for player in year_data.players if player["stats"]][:8]
+
+
+@pytest.fixture(autouse=True)
+def fresh_results(monkeypatch):
+    def fresh():
+        monkeypatch.setattr(matchup_resource, "matchup_results", LRUCache(maxsize=8))
+
+    fresh()
+    return fresh
+
+
+def post(client, team_a, team_b, **params):
+    return client.post(
+        "/api/players/2024/matchup",
+        json={"team_a": team_a, "team_b": team_b, "weeks": 2000, **params},
+    )
+
+
+def test_result_does_not_depend_on_order(client, ids, fresh_results):
+    forward = post(client, ids[:4], ids[4:])
+    fresh_results()  # Simulated again rather than read from the cache
+    backward = post(client, ids[3::-1], ids[:3:-1])
+
+    assert forward.status_code == backward.status_code == 200
+    assert forward.get_json() == backward.get_json()
+
+
+@pytest.mark.parametrize(
+    "team_a, team_b",
+    [
+        ([0, 0, 1], [2, 3]),
+        ([0, 1], [2, 3, 3]),
+        ([0, 1, 2], [2, 3]),
+    ],
+)
+def test_rejects_repeated_players(client, ids, team_a, team_b):
+    response = post(client, [ids[i] for i in team_a], [ids[i] for i in team_b])
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_minutes_spread_shrinks_with_mpg():
+    stats = {key: 1.0 for key in ["gp", "fgm", "fga", "ftm", "fta"]}
+    stats.update({key: 1.0 for key in matchup.counting_stats})
+    roster = matchup.Roster([{**stats, "mpg": 36.0}, {**stats, "mpg": 10.0}])
+
+    starter, bench = roster.minutes_cv
+    assert starter < bench
+
+
+def test_workers_give_the_same_result(monkeypatch, dataset, ids):
+    players = dataset.get_year("2024").players
+    stats = [player["stats"] for player in players if player["id"] in ids]
+    weeks = 3 * matchup.chunk_weeks
+
+    single = matchup.simulate_matchup(stats[:4], stats[4:], weeks, seed=7)
+    monkeypatch.setattr(config, "SIM_WORKERS", 2)
+    pooled = matchup.simulate_matchup(stats[:4], stats[4:], weeks, seed=7)
+
+    assert pooled == single
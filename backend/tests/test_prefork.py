@@ -0,0 +1,32 @@
+import os
+import signal
+import time
+
+from utils import prefork
+
+
+def test_crashing_service_is_restarted_with_backoff(tmp_path):
+    starts = tmp_path / "starts"
+
+    def crash():
+        with open(starts, "a") as f:
+            f.write(f"{time.monotonic()}\n")
+        raise RuntimeError("crashed on start")
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            prefork.serve_prefork(None, "127.0.0.1", 0, 0, 1, services=[crash])
+        finally:
+            os._exit(0)
+
+    time.sleep(2.5)
+    os.kill(pid, signal.SIGTERM)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    # Restarted after 0.5s, then 1s: not in a tight loop
+    times = [float(line) for line in starts.read_text().split()]
+    assert len(times) == 3
+    gaps = [after - before for before, after in zip(times, times[1:])]
+    assert gaps[0] >= 0.5 and gaps[1] >= 1.0
@@ -0,0 +1,128 @@
+import copy
+import functools
+
+import pytest
+
+import data.players as pipeline
+from app import prepare, reload_datasets
+from benchmarks.fixtures import auction_rows, hashtag_rows, roster_records
+from utils import season_db, storage
+
+
+@pytest.fixture
+def sources(seasons_dir):
+    players = storage.read_season("2024", seasons_dir)["players"]
+    return {
+        "rosters": roster_records(players),
+        "projections": hashtag_rows(players),
+        "auction": auction_rows(players),
+    }
+
+
+@pytest.fixture
+def fetchers(sources):
+    # Fresh copies on every call, like a real fetch
+    return pipeline.Fetchers(
+        **{
+            name: functools.partial(copy.deepcopy, records)
+            for name, records in sources.items()
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def pipeline_dirs(dataset, monkeypatch):
+    seasons_dir = dataset.seasons_dir
+    for name in ("read_season", "write_season", "write_pipeline_metrics"):
+        monkeypatch.setattr(
+            pipeline,
+            name,
+            functools.partial(getattr(storage, name), seasons_dir=seasons_dir),
+        )
+    monkeypatch.setattr(
+        season_db,
+        "write_season",
+        functools.partial(season_db.write_season, db_path=dataset.db_path),
+    )
+
+
+def test_main_runs_with_fake_fetchers(dataset, fetchers):
+    assert pipeline.main(["2024", "--full"], fetchers) == "updated"
+    assert pipeline.main(["2024"], fetchers) == "unchanged"
+    metrics = storage.read_pipeline_metrics(dataset.seasons_dir)
+    assert metrics["seasons"]["2024"]["status"] == "unchanged"
+    assert season_db.available_seasons(dataset.db_path) == ["2024"]
+
+
+def test_reload_swaps_in_prepared_dataset(dataset, fetchers, sources, client):
+    dataset.auto_reload = False
+    old = dataset.get_year("2024")
+    prepare(old)
+    top = old.players[0]
+    assert client.get(f"/api/players/history/{top['id']}").status_code == 200
+
+    sources["projections"][0]["rank"] = 999
+    assert pipeline.main(["2024", "--full"], fetchers) == "updated"
+
+    # Until the swap, requests are served the resident dataset, history too
+    assert dataset.get_year("2024") is old
+    history = client.get(f"/api/players/history/{top['id']}").get_json()
+    assert history["seasons"][-1]["rank"] == top["rank"]
+
+    prepared = []
+    assert dataset.reload(prepared.append) == ["2024"]
+    new = dataset.get_year("2024")
+    assert prepared == [new] and new is not old
+    assert old.players[0]["rank"] == top["rank"]
+
+    reload_datasets()
+    history = client.get(f"/api/players/history/{top['id']}").get_json()
+    assert history["seasons"][-1]["rank"] == 999
+    assert dataset.reload() == []
+
+
+def test_failed_fetch_keeps_serving(dataset, fetchers):
+    def fail():
+        raise ConnectionError("offline")
+
+    fetchers.rosters = fail
+    old = dataset.get_year("2024")
+    with pytest.raises(ConnectionError):
+        pipeline.main(["2024"], fetchers)
+    metrics = storage.read_pipeline_metrics(dataset.seasons_dir)
+    assert metrics["seasons"]["2024"]["status"] == "failed"
+    assert "2024" not in dataset.reload()
+    assert dataset.get_year("2024") is old
+
+
+def test_corrupt_shard_is_rebuilt(dataset, fetchers):
+    assert pipeline.main(["2024", "--full"], fetchers) == "updated"
+    built = storage.read_season("2024", dataset.seasons_dir)
+    path = storage.season_path("2024", dataset.seasons_dir)
+    with open(path, "rb") as f:
+        stored = f.read()
+    with open(path, "wb") as f:
+        f.write(stored[: len(stored) // 2])
+
+    # An incremental run falls back to a full rebuild
+    assert pipeline.main(["2024"], fetchers) == "updated"
+    rebuilt = storage.read_season("2024", dataset.seasons_dir)
+    assert rebuilt["players"] == built["players"]
+    assert pipeline.main(["2024"], fetchers) == "unchanged"
+
+
+def test_failed_db_write_is_retried(dataset, fetchers, monkeypatch):
+    write_season = season_db.write_season
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(season_db, "write_season", fail)
+    with pytest.raises(OSError):
+        pipeline.main(["2024", "--full"], fetchers)
+    assert season_db.available_seasons(dataset.db_path) == []
+
+    # The next incremental run still has something to write
+    monkeypatch.setattr(season_db, "write_season", write_season)
+    assert pipeline.main(["2024"], fetchers) == "updated"
+    assert season_db.available_seasons(dataset.db_path) == ["2024"]
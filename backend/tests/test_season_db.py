@@ -0,0 +1,61 @@
+import sqlite3
+
+import pytest
+
+from utils import season_db, storage
+
+
+@pytest.fixture
+def db_path(seasons_dir, tmp_path):
+    path = str(tmp_path / "seasons.db")
+    season = storage.read_season("2024", seasons_dir)
+    season_db.write_season(
+        "2024",
+        season["players"],
+        season["category_stats_totals"],
+        season["category_stats_per"],
+        db_path=path,
+    )
+    return path
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    # Every statement run on a connection the store opens
+    statements = []
+    connect = sqlite3.connect
+
+    def traced_connect(*args, **kwargs):
+        connection = connect(*args, **kwargs)
+        connection.set_trace_callback(statements.append)
+        return connection
+
+    monkeypatch.setattr(season_db.sqlite3, "connect", traced_connect)
+    return statements
+
+
+def test_round_trip(db_path, seasons_dir):
+    season = storage.read_season("2024", seasons_dir)
+    stored = season_db.read_season("2024", db_path)
+
+    assert stored["players"] == season["players"]
+    assert stored["category_stats_totals"] == season["category_stats_totals"]
+
+
+def test_reads_only_query(db_path, statements):
+    assert season_db.available_seasons(db_path) == ["2024"]
+    assert season_db.season_updated_at("2024", db_path) is not None
+    season_db.read_season("2024", db_path)
+
+    assert statements
+    assert all(statement.startswith("SELECT") for statement in statements)
+
+
+def test_missing_store(tmp_path):
+    db_path = str(tmp_path / "missing.db")
+
+    assert season_db.available_seasons(db_path) == []
+    assert season_db.season_updated_at("2024", db_path) is None
+    with pytest.raises(KeyError):
+        season_db.read_season("2024", db_path)
+    assert not (tmp_path / "missing.db").exists()
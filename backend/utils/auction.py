@@ -0,0 +1,174 @@
+"""
+League-aware auction values.
+
+Each player's value is the sum of their punt-adjusted z-scores (the same
+z-scores and weights as utils.scores). The drafted pool is allocated
+like the league would fill its rosters: first every team's starting
+slots, position by position from the shallowest (fewest eligible players
+per slot), each with the best players left who are eligible there; then
+the remaining roster spots with the best players left at any position.
+A position's replacement level is the best player it has left outside
+that pool, so positions whose slots reach deeper get a lower one. A
+multi-position player is measured against their easiest position. Value
+over replacement is then split across the league's spendable budget,
+after every rostered player gets the minimum bid.
+"""
+
+import numpy as np
+
+from utils.query import parse_count
+from utils.scores import parse_punts, z_weights
+
+positions = ["PG", "SG", "SF", "PF", "C"]
+
+
+class LeagueSettings:
+    teams: int
+    budget: int  # Per team
+    roster_size: int
+    min_bid: int
+    slots: tuple  # Starting slots per team, in positions order
+    mask: int  # Punted categories, see utils.scores.parse_punts
+
+    limits = {"teams": (2, 30), "budget": (1, 10000), "roster_size": (1, 30)}
+
+    def __init__(
+        self, teams=12, budget=200, roster_size=13, min_bid=1, slots=None, mask=0
+    ):
+        self.teams = teams
+        self.budget = budget
+        self.roster_size = roster_size
+        self.min_bid = min_bid
+        self.slots = slots or (1,) * len(positions)
+        self.mask = mask
+
+        for name, (low, high) in self.limits.items():
+            if not low <= getattr(self, name) <= high:
+                raise ValueError(f"{name} must be between {low} and {high}")
+        if not 0 <= min_bid * roster_size <= budget:
+            raise ValueError("min_bid * roster_size must fit in the budget")
+        if sum(self.slots) > roster_size:
+            raise ValueError("More position slots than roster spots")
+
+    @classmethod
+    def from_args(cls, args):
+        """Build settings from request args; raises ValueError."""
+        return cls(
+            teams=parse_count(args.get("teams"), "teams", 12),
+            budget=parse_count(args.get("budget"), "budget", 200),
+            roster_size=parse_count(args.get("roster"), "roster", 13),
+            min_bid=parse_count(args.get("min_bid"), "min_bid", 1),
+            slots=parse_slots(args.get("slots")),
+            mask=parse_punts(args.get("punt")),
+        )
+
+    @property
+    def key(self):
+        return (
+            self.teams,
+            self.budget,
+            self.roster_size,
+            self.min_bid,
+            self.slots,
+            self.mask,
+        )
+
+
+def parse_slots(value):
+    # "PG:1,SG:1,C:2" -> starting slots per position, missing ones are 0
+    if not value:
+        return None
+    slots = dict.fromkeys(positions, 0)
+    for part in value.split(","):
+        position, _, count = part.strip().partition(":")
+        if position.upper() not in slots:
+            raise ValueError(f"Invalid position: {position}")
+        slots[position.upper()] = parse_count(count, "slots", 1)
+    return tuple(slots[position] for position in positions)
+
+
+def eligibility(players):
+    # (players, positions) booleans
+    return np.array(
+        [
+            [position in player["positions"] for position in positions]
+            for player in players
+        ],
+        dtype=bool,
+    ).reshape(len(players), len(positions))
+
+
+def allocate_pool(value, eligible, settings, pool_size):
+    """Drafted players, as booleans: starting slots first, then the rest."""
+    by_value = np.argsort(-value, kind="stable")
+    drafted = np.zeros(len(value), dtype=bool)
+    slots = np.array(settings.slots)
+    # Shallowest positions pick first, so deeper ones can't take their players
+    depth = eligible.sum(axis=0) / np.maximum(slots, 1)
+    for j in np.argsort(depth, kind="stable"):
+        candidates = by_value[eligible[by_value, j] & ~drafted[by_value]]
+        drafted[candidates[: settings.teams * slots[j]]] = True
+    remaining = max(pool_size - int(drafted.sum()), 0)
+    drafted[by_value[~drafted[by_value]][:remaining]] = True
+    return drafted
+
+
+def replacement_level(value, eligible, drafted):
+    # Best of the eligible players left undrafted; with none left, the
+    # worst eligible one, or the worst player overall
+    left = value[eligible & ~drafted]
+    if len(left):
+        return left.max()
+    if eligible.any():
+        return value[eligible].min()
+    return value.min()
+
+
+class AuctionValues:
+    """Dollar values for one season, mode and set of league settings."""
+
+    def __init__(self, table, eligible, settings):
+        keep = np.array(
+            [0.0 if settings.mask & (1 << i) else 1.0 for i in range(len(z_weights))]
+        )
+        value = table.z_scores @ (z_weights * keep)
+        pool_size = min(settings.teams * settings.roster_size, len(value))
+
+        drafted = allocate_pool(value, eligible, settings, pool_size)
+        levels = np.array(
+            [
+                replacement_level(value, eligible[:, j], drafted)
+                for j in range(len(positions))
+            ]
+        )
+        replacement = np.where(eligible, levels, np.inf).min(axis=1)
+        no_position = ~eligible.any(axis=1)
+        replacement[no_position] = replacement_level(
+            value, np.ones(len(value), dtype=bool), drafted
+        )
+        over = value - replacement
+
+        order = np.argsort(-over, kind="stable")
+        surplus = np.where(drafted, np.clip(over, 0, None), 0.0)
+
+        spendable = settings.teams * settings.budget - pool_size * settings.min_bid
+        share = surplus / surplus.sum() if surplus.sum() > 0 else surplus
+        self.ids = table.ids
+        self.value = value
+        self.replacement = replacement
+        self.over = over
+        self.dollars = np.where(drafted, settings.min_bid + share * spendable, 0.0)
+        self.order = order
+
+    def ranking(self):
+        return [
+            {
+                "id": int(self.ids[i]),
+                "rank": rank,
+                "dollars": round(float(self.dollars[i]), 1),
+                "value": float(self.value[i]),
+                "replacement": float(self.replacement[i]),
+                "value_over_replacement": float(self.over[i]),
+            }
+            for rank, i in enumerate(self.order, start=1)
+        ]
@@ -7,3 +7,32 @@ load_dotenv()
 DEBUG = os.getenv("ENVIRONEMENT") == "DEV"
 HOST = os.getenv("APPLICATION_HOST", "0.0.0.0")
 PORT = int(os.getenv("APPLICATION_PORT", "5000"))
+# Serving processes; more than one forks workers that share the loaded data
+WORKERS = int(os.getenv("WORKERS", "1"))
+THREADS = int(os.getenv("THREADS", "4"))  # waitress request threads per worker
+CACHE_MAX_AGE = int(os.getenv("CACHE_MAX_AGE", "60"))
+BATCH_MAX_IDS = int(os.getenv("BATCH_MAX_IDS", "500"))
+# Longest a request waits on another one building the same data (then 503)
+COALESCE_TIMEOUT = float(os.getenv("COALESCE_TIMEOUT", "30"))
+# Seasons read from the SQLite store (archives) kept in memory at once
+ARCHIVE_YEARS = int(os.getenv("ARCHIVE_YEARS", "2"))
+
+# Data pipeline
+ESPN_API_URL = os.getenv(
+    "ESPN_API_URL", "https://site.api.espn.com/apis/site/v2/sports/basketball/nba"
+)
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_WORKERS = int(os.getenv("HTTP_WORKERS", "8"))
+
+# Background refresh: the pipeline runs in the server every REFRESH_INTERVAL
+# seconds (0 disables it), refetching rosters and injuries every time but the
+# Hashtag projections and auction values at most every PROJECTIONS_INTERVAL.
+# Changed season files are checked for every RELOAD_INTERVAL seconds.
+REFRESH_INTERVAL = int(os.getenv("REFRESH_INTERVAL", "0"))
+PROJECTIONS_INTERVAL = int(os.getenv("PROJECTIONS_INTERVAL", "21600"))
+RELOAD_INTERVAL = float(os.getenv("RELOAD_INTERVAL", "5"))
+
+# Matchup simulator; more than one worker runs chunks in a process pool
+SIM_WORKERS = int(os.getenv("SIM_WORKERS", "1"))
+SIM_MAX_WEEKS = int(os.getenv("SIM_MAX_WEEKS", "100000"))
@@ -0,0 +1,243 @@
+import logging
+import os
+import threading
+
+from utils import config, season_db, storage
+from utils.indexes import PlayerIndexes
+from utils.lru import LRUCache
+from utils.search import PlayerSearchIndex
+from utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class YearDataset:
+    year: str
+    # (inode, mtime_ns, size) of the season file, or ("db", updated_at)
+    signature: tuple | None
+    players: list[dict]
+    category_stats_totals: dict
+    category_stats_per: dict
+    indexes: PlayerIndexes
+    search: PlayerSearchIndex
+    derived: dict  # Values computed from this year's data, e.g. response bodies
+
+    def __init__(
+        self, year, signature, players, category_stats_totals, category_stats_per
+    ):
+        self.year = year
+        self.signature = signature
+        self.players = players
+        self.category_stats_totals = category_stats_totals
+        self.category_stats_per = category_stats_per
+        self.indexes = PlayerIndexes(players)
+        self.search = PlayerSearchIndex(players)
+        self.derived = {}
+        self._flights = SingleFlight()
+
+    def memoize(self, key, build):
+        # Derived values live and die with the dataset they were built from,
+        # so a reload never serves stale bytes. Concurrent misses of one key
+        # wait for a single build.
+        value = self.derived.get(key)
+        if value is None:
+            value = self._flights.do(key, lambda: self._build(key, build))
+        return value
+
+    def _build(self, key, build):
+        value = self.derived.get(key)
+        if value is None:
+            value = build()
+            self.derived[key] = value
+        return value
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def dataset_from_season(year, signature, season):
+    return YearDataset(
+        year=year,
+        signature=signature,
+        players=season["players"],
+        category_stats_totals=season["category_stats_totals"],
+        category_stats_per=season["category_stats_per"],
+    )
+
+
+def load_year(year, seasons_dir, signature):
+    return dataset_from_season(year, signature, storage.read_season(year, seasons_dir))
+
+
+class DatasetCache:
+    """
+    Process-wide cache of the per-season player files.
+
+    Each season is parsed once and kept resident; every lookup only stats
+    the season file, and a new dataset is built and swapped in when its
+    inode, mtime or size changes (e.g. after `make setup_players`). Readers
+    always get a complete dataset: a failed reload keeps serving the
+    previous one.
+
+    Seasons that only exist in the SQLite store (e.g. imported archives)
+    are read from it on demand, and only the most recently used
+    config.ARCHIVE_YEARS of them stay resident.
+
+    With auto_reload off, requests are always served the resident season
+    and new files are only picked up by reload(), e.g. from a background
+    thread, so no request ever waits on a parse.
+    """
+
+    def __init__(self, seasons_dir=storage.SEASONS_DIR, db_path=storage.DATABASE_FILE):
+        self.seasons_dir = seasons_dir
+        self.db_path = db_path
+        self._years = {}
+        self._failed_signatures = {}
+        self._manifest = (None, [])  # (signature, available years)
+        self._database = (None, [])  # (signature, years in the store)
+        self._archived = LRUCache(maxsize=config.ARCHIVE_YEARS, name="archived_years")
+        self._lock = threading.Lock()  # Held to swap in a new mapping
+        self._flights = SingleFlight()
+        self.auto_reload = True
+
+    def _is_current(self, year_data, signature):
+        if year_data is None:
+            return False
+        return signature in (
+            year_data.signature,
+            self._failed_signatures.get(year_data.year),
+        )
+
+    def get_year(self, year):
+        if year not in self.season_years():
+            if year in self.archived_years():
+                return self._get_archived(year)
+            return None
+        path = storage.season_path(year, self.seasons_dir)
+        year_data = self._years.get(year)
+        if year_data is not None and not self.auto_reload:
+            return year_data
+        signature = file_signature(path)
+        if self._is_current(year_data, signature):
+            return year_data
+
+        # Requests that find the same new file wait for a single parse
+        if signature is None:
+            return None
+        return self._flights.do(
+            ("season", year, signature), lambda: self._load(year, path, signature)
+        )
+
+    def _load(self, year, path, signature):
+        year_data = self._years.get(year)
+        if self._is_current(year_data, signature):
+            return year_data
+        try:
+            year_data = load_year(year, self.seasons_dir, signature)
+        except (OSError, ValueError, KeyError) as e:
+            if year not in self._years:
+                raise
+            logger.error(f"Could not reload {path}, keeping old data: {e}")
+            self._failed_signatures[year] = signature
+            return self._years[year]
+        logger.info(f"Loaded {year} players dataset from {path}")
+        # Swap in a new mapping so concurrent readers never see it mutate
+        with self._lock:
+            self._years = {**self._years, year: year_data}
+        return year_data
+
+    def reload(self, prepare=None):
+        """
+        Load every season file that changed and run prepare(year_data) on
+        it (e.g. to warm its bodies) before swapping it in. Requests keep
+        being served the previous dataset until then. Returns the years
+        swapped.
+        """
+        swapped = []
+        for year in self.season_years():
+            path = storage.season_path(year, self.seasons_dir)
+            signature = file_signature(path)
+            if signature is None or self._is_current(self._years.get(year), signature):
+                continue
+            try:
+                year_data = load_year(year, self.seasons_dir, signature)
+                if prepare:
+                    prepare(year_data)
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Could not reload {path}, keeping old data: {e}")
+                self._failed_signatures[year] = signature
+                continue
+            with self._lock:
+                self._years = {**self._years, year: year_data}
+            logger.info(f"Swapped in {year} players dataset from {path}")
+            swapped.append(year)
+        return swapped
+
+    def _get_archived(self, year):
+        # (signature of the store, dataset): the store is only queried again
+        # once its file changes
+        signature = file_signature(self.db_path)
+        cached = self._archived.get(year)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        return self._flights.do(
+            ("db", year, signature), lambda: self._load_archived(year, signature)
+        )
+
+    def _load_archived(self, year, signature):
+        cached = self._archived.get(year)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        updated_at = season_db.season_updated_at(year, self.db_path)
+        if updated_at is None:
+            return None
+        if cached is not None and cached[1].signature == ("db", updated_at):
+            year_data = cached[1]
+        else:
+            season = season_db.read_season(year, self.db_path)
+            year_data = dataset_from_season(year, ("db", updated_at), season)
+            logger.info(f"Loaded {year} players dataset from {self.db_path}")
+        self._archived.put(year, (signature, year_data))
+        return year_data
+
+    def season_years(self):
+        """Years with a season file, kept resident."""
+        signature = file_signature(storage.manifest_path(self.seasons_dir))
+        cached_signature, years = self._manifest
+        if signature != cached_signature:
+            years = storage.available_seasons(self.seasons_dir)
+            self._manifest = (signature, years)
+        return years
+
+    def archived_years(self):
+        """Years only in the SQLite store."""
+        signature = file_signature(self.db_path)
+        cached_signature, years = self._database
+        if signature != cached_signature:
+            years = season_db.available_seasons(self.db_path) if signature else []
+            self._database = (signature, years)
+        season_years = set(self.season_years())
+        return [year for year in years if year not in season_years]
+
+    def available_years(self):
+        return sorted({*self.season_years(), *self.archived_years()})
+
+    def version(self):
+        """
+        Signatures of the season datasets being served, which only change
+        once a new one is swapped in, and of the SQLite store.
+        """
+        seasons = []
+        for year in self.season_years():
+            year_data = self.get_year(year)
+            seasons.append((year, year_data.signature if year_data else None))
+        return tuple(seasons), file_signature(self.db_path)
+
+
+players_dataset = DatasetCache()
@@ -0,0 +1,117 @@
+"""
+Multi-season player history.
+
+Every available season is joined by player id once, when the seasons are
+loaded: each player gets their line for every season they have stats in
+(per game stats, rank and the z-scores of utils.scores, in both modes),
+the deltas between consecutive seasons, and the slope of each z-score
+across seasons, in z per year.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+from models import PlayerStats
+from utils.scores import score_categories, z_weights
+
+z_keys = score_categories + ["total"]
+
+
+def z_line(z_scores):
+    # Per category z-scores and their weighted total, as in the auction values
+    total = float(np.dot(z_scores, z_weights))
+    return {**dict(zip(score_categories, z_scores)), "total": total}
+
+
+def season_line(year, player, z_scores):
+    return {
+        "year": year,
+        "team": player["team"],
+        "age": player["age"],
+        "positions": player["positions"],
+        "rank": player["rank"],
+        "stats": player["stats"],
+        "z_scores": {mode: z_line(z) for mode, z in z_scores.items()},
+    }
+
+
+def season_delta(before, after):
+    return {
+        "from": before["year"],
+        "to": after["year"],
+        "stats": {
+            key: round(after["stats"][key] - before["stats"][key], 4)
+            for key in PlayerStats.fields
+        },
+        "z_scores": {
+            mode: {
+                key: after["z_scores"][mode][key] - before["z_scores"][mode][key]
+                for key in z_keys
+            }
+            for mode in after["z_scores"]
+        },
+    }
+
+
+def slope(xs, ys):
+    # Least squares slope of ys over xs
+    xs = xs - xs.mean()
+    return float(xs @ (ys - ys.mean()) / (xs @ xs))
+
+
+def z_trend(lines):
+    # None with a single season
+    if len(lines) < 2:
+        return None
+    years = np.array([int(line["year"]) for line in lines], dtype=np.float64)
+    return {
+        mode: {
+            key: slope(years, np.array([line["z_scores"][mode][key] for line in lines]))
+            for key in z_keys
+        }
+        for mode in lines[-1]["z_scores"]
+    }
+
+
+class PlayerHistory:
+    """
+    Player id -> precomputed history, over seasons given in year order as
+    (year_data, {mode: ScoreTable}) pairs.
+    """
+
+    def __init__(self, seasons):
+        self.years = [year_data.year for year_data, _ in seasons]
+        names = {}
+        lines = defaultdict(list)
+        for year_data, tables in seasons:
+            z_by_id = {
+                mode: dict(zip(table.ids.tolist(), table.z_scores.tolist()))
+                for mode, table in tables.items()
+            }
+            for player in year_data.players:
+                if player["stats"] is None:
+                    continue
+                z_scores = {mode: z[player["id"]] for mode, z in z_by_id.items()}
+                lines[player["id"]].append(
+                    season_line(year_data.year, player, z_scores)
+                )
+                names[player["id"]] = (player["first_name"], player["last_name"])
+
+        self.by_id = {}
+        for player_id, player_lines in lines.items():
+            first_name, last_name = names[player_id]
+            self.by_id[player_id] = {
+                "id": player_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "seasons": player_lines,
+                "deltas": [
+                    season_delta(before, after)
+                    for before, after in zip(player_lines, player_lines[1:])
+                ],
+                "trend": z_trend(player_lines),
+            }
+
+    def get(self, player_id):
+        return self.by_id.get(player_id)
@@ -0,0 +1,50 @@
+from collections import defaultdict
+
+
+class PlayerIndexes:
+    """
+    Secondary indexes over one season's players, built when it is loaded.
+
+    Each index maps a value to the frozenset of positions in the player
+    list, so a filter is a union within a parameter (pos=PG,SG) and an
+    intersection across parameters, never a scan of the players. by_id
+    maps an ESPN id to its position.
+    """
+
+    def __init__(self, players):
+        self.by_id = {player["id"]: i for i, player in enumerate(players)}
+        by_team = defaultdict(set)
+        by_position = defaultdict(set)
+        injured = set()
+        for i, player in enumerate(players):
+            by_team[player["team"]].add(i)
+            for position in player["positions"]:
+                if position:
+                    by_position[position].add(i)
+            if player["injuries"]:
+                injured.add(i)
+
+        self.all = frozenset(range(len(players)))
+        self.by_team = {team: frozenset(ids) for team, ids in by_team.items()}
+        self.by_position = {pos: frozenset(ids) for pos, ids in by_position.items()}
+        self.injured = frozenset(injured)
+        self.healthy = self.all - self.injured
+
+    def match(self, teams=None, positions=None, healthy=None):
+        """Positions of the players matching every given filter."""
+        matched = []
+        if teams:
+            matched.append(self._union(self.by_team, teams))
+        if positions:
+            matched.append(self._union(self.by_position, positions))
+        if healthy is not None:
+            matched.append(self.healthy if healthy else self.injured)
+        if not matched:
+            return self.all
+        # Intersect starting from the smallest set
+        matched.sort(key=len)
+        return matched[0].intersection(*matched[1:])
+
+    @staticmethod
+    def _union(index, keys):
+        return frozenset().union(*(index.get(key, ()) for key in keys))
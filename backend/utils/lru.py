@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+
+from utils.singleflight import SingleFlight
+
+# Named caches, reported by /api/metrics
+caches = {}
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping for bounded memoization."""
+
+    def __init__(self, maxsize=128, name=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        if name:
+            caches[name] = self
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def get_or_build(self, key, build):
+        # Concurrent misses of one key wait for a single build
+        value = self.get(key)
+        if value is None:
+            value = self._flights.do(key, lambda: self._build(key, build))
+        return value
+
+    def _build(self, key, build):
+        # A build that finished just before this one started has stored it
+        with self._lock:
+            value = self._items.get(key)
+        return value if value is not None else self.put(key, build())
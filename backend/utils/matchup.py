@@ -0,0 +1,150 @@
+"""
+Monte Carlo head-to-head category matchups.
+
+A simulated week gives every player a few games. Each game they play
+with probability gp / 82, their minutes vary around mpg by a few
+minutes (so relatively more for bench players than starters), and their
+counting stats are Poisson draws at their per-game rates scaled by those
+minutes, makes and misses included. Weekly team totals are compared
+category by category.
+
+Weeks are simulated in fixed-size chunks, each with its own seed spawned
+from the request's seed. Results therefore do not depend on how many
+workers run the chunks.
+"""
+
+import threading
+
+import numpy as np
+
+from utils import config
+
+categories = ["fg_pct", "ft_pct", "tpm", "pts", "reb", "ast", "stl", "blk", "to"]
+counting_stats = ["tpm", "pts", "reb", "ast", "stl", "blk", "to"]
+season_games = 82.0
+minutes_sd = 5.0  # Game-to-game standard deviation of minutes played
+chunk_weeks = 5000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class Roster:
+    """Per-game rates of one team's players, as a (players, stats) matrix."""
+
+    # Makes and misses are drawn separately: thinning a Poisson number of
+    # attempts by a make probability gives independent Poisson makes and
+    # misses, so no binomial draw is needed
+    stats = counting_stats + ["fgm", "fg_miss", "ftm", "ft_miss"]
+
+    def __init__(self, players_stats):
+        def column(key):
+            return np.array([s[key] for s in players_stats], dtype=np.float64)
+
+        self.availability = np.clip(column("gp") / season_games, 0, 1)
+        # Relative spread of minutes around mpg
+        self.minutes_cv = np.clip(minutes_sd / np.maximum(column("mpg"), 1.0), 0, 1)
+        self.rates = np.column_stack(
+            [column(key) for key in counting_stats]
+            + [
+                column("fgm"),
+                np.clip(column("fga") - column("fgm"), 0, None),
+                column("ftm"),
+                np.clip(column("fta") - column("ftm"), 0, None),
+            ]
+        ).reshape(len(players_stats), len(self.stats))
+
+    def simulate(self, rng, weeks, games):
+        """Weekly totals per category, as (weeks,) arrays."""
+        shape = (weeks, len(self.availability), games)
+        played = rng.random(shape) < self.availability[None, :, None]
+        spread = self.minutes_cv[None, :, None]
+        minutes = np.clip(rng.normal(1.0, spread, shape), 0, None) * played
+
+        # A sum of Poissons is Poisson with the summed rate, so each team
+        # week is one draw per stat over the minutes-weighted rates
+        drawn = rng.poisson(minutes.sum(axis=2) @ self.rates)
+        totals = dict(zip(self.stats, drawn.T))
+        for pct, made, missed in (
+            ("fg_pct", "fgm", "fg_miss"),
+            ("ft_pct", "ftm", "ft_miss"),
+        ):
+            attempts = totals[made] + totals[missed]
+            totals[pct] = np.divide(
+                totals[made], attempts, out=np.zeros(weeks), where=attempts > 0
+            )
+        return totals
+
+
+def simulate_chunk(roster_a, roster_b, weeks, games, seed):
+    """
+    Category wins of team A over a chunk of weeks (ties count half), and
+    how many weeks each team won overall.
+    """
+    rng = np.random.default_rng(seed)
+    a = roster_a.simulate(rng, weeks, games)
+    b = roster_b.simulate(rng, weeks, games)
+
+    won = np.empty((len(categories), weeks))
+    for j, key in enumerate(categories):
+        sign = -1 if key == "to" else 1
+        diff = sign * (a[key] - b[key])
+        won[j] = (diff > 0) + 0.5 * (diff == 0)
+
+    a_categories = won.sum(axis=0)
+    b_categories = len(categories) - a_categories
+    return (
+        won.sum(axis=1),
+        int((a_categories > b_categories).sum()),
+        int((a_categories < b_categories).sum()),
+    )
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Imported here, as multiprocessing is only needed with
+            # SIM_WORKERS > 1
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Created from a request thread of a multithreaded server, so the
+            # workers are spawned: forking would copy the other threads' locks
+            _executor = ProcessPoolExecutor(
+                max_workers=config.SIM_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def simulate_matchup(stats_a, stats_b, weeks, games=3, seed=0):
+    roster_a, roster_b = Roster(stats_a), Roster(stats_b)
+    sizes = [chunk_weeks] * (weeks // chunk_weeks)
+    if weeks % chunk_weeks:
+        sizes.append(weeks % chunk_weeks)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunks = [(roster_a, roster_b, size, games, s) for size, s in zip(sizes, seeds)]
+
+    if config.SIM_WORKERS > 1 and len(chunks) > 1:
+        results = list(get_executor().map(simulate_chunk, *zip(*chunks)))
+    else:
+        results = [simulate_chunk(*chunk) for chunk in chunks]
+
+    won = sum(result[0] for result in results)
+    a_weeks = sum(result[1] for result in results)
+    b_weeks = sum(result[2] for result in results)
+    return {
+        "weeks": weeks,
+        "games": games,
+        "categories": {key: float(wins / weeks) for key, wins in zip(categories, won)},
+        "expected_categories": {
+            "team_a": float(won.sum() / weeks),
+            "team_b": float(len(categories) - won.sum() / weeks),
+        },
+        "win_probability": {
+            "team_a": a_weeks / weeks,
+            "team_b": b_weeks / weeks,
+            "tie": (weeks - a_weeks - b_weeks) / weeks,
+        },
+    }
@@ -0,0 +1,155 @@
+"""
+In-process metrics, rendered in the Prometheus text exposition format.
+
+instrument(app) records every request's route, status, latency and body
+size, plus the number of requests in flight. The pipeline's stage
+durations are written next to the season files by data/players.py and
+exported from there, as it runs in its own process.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def items(self):
+        with self._lock:
+            return sorted(self._values.items())
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        return self.header() + [
+            f"{self.name}{format_labels(self.labels, labels)} {value}"
+            for labels, value in self.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels):
+        self.inc(*labels, amount=-1)
+
+    def set(self, *labels, value):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels, value):
+        with self._lock:
+            # Per bucket counts (the last one is +Inf) and the sum
+            series = self._values.get(labels)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), 0.0)
+            counts = series[0].copy()
+            counts[bisect_left(self.buckets, value)] += 1
+            # Replaced rather than mutated, so a render never sees half of it
+            self._values[labels] = (counts, series[1] + value)
+
+    def render(self):
+        lines = self.header()
+        for labels, (counts, total) in self.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = format_labels(self.labels + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            count = cumulative
+            label_text = format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+requests_total = Counter(
+    "http_requests_total", "Requests handled", ("method", "route", "status")
+)
+request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency", ("method", "route")
+)
+response_size = Histogram(
+    "http_response_size_bytes", "Response body size", ("route",), SIZE_BUCKETS
+)
+requests_in_flight = Gauge("http_requests_in_flight", "Requests being handled")
+
+registry = [requests_total, request_duration, response_size, requests_in_flight]
+
+
+def route_label():
+    # The URL rule, not the path, so ids and years don't explode the series
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+def instrument(app):
+    @app.before_request
+    def start_timer():
+        g.metrics_start = time.perf_counter()
+        requests_in_flight.inc()
+
+    @app.after_request
+    def record(response):
+        route = route_label()
+        requests_total.inc(request.method, route, response.status_code)
+        request_duration.observe(
+            request.method,
+            route,
+            value=time.perf_counter() - g.metrics_start,
+        )
+        if response.content_length is not None:
+            response_size.observe(route, value=response.content_length)
+        return response
+
+    @app.teardown_request
+    def finish(_):
+        if "metrics_start" in g:
+            requests_in_flight.dec()
+
+
+def render(extra=()):
+    lines = []
+    for metric in [*registry, *extra]:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,112 @@
+import re
+
+import unidecode
+
+SKIP = "SKIP"
+
+# Hashtag name -> ESPN name, or SKIP for players to leave out
+name_exceptions = {
+    "Kenyon Martin Jr.": "KJ Martin",
+    "Xavier Tillman Sr.": "Xavier Tillman",
+    "Nicolas Claxton": "Nic Claxton",
+    "Alexandre Sarr": "Alex Sarr",
+    "Carlton Carrington": "Bub Carrington",
+    "Joe Harris": SKIP,
+    "Dennis Smith Jr.": SKIP,
+    "Boogie Ellis": SKIP,
+}
+
+name_suffixes = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+_punctuation = re.compile(r"[.'’`]")
+_separators = re.compile(r"[\s\-,]+")
+
+
+def normalize_name(name):
+    # "Luka Dončić" -> "luka doncic", "P.J. Washington" -> "pj washington"
+    name = unidecode.unidecode(name).lower()
+    name = _punctuation.sub("", name)
+    return " ".join(_separators.split(name)).strip()
+
+
+def split_name(normalized):
+    # -> (first name, last name without generational suffix)
+    tokens = normalized.split(" ")
+    while len(tokens) > 2 and tokens[-1] in name_suffixes:
+        tokens.pop()
+    return tokens[0], " ".join(tokens[1:])
+
+
+def first_names_match(a, b):
+    # Initials ("kj"), nicknames that shorten the name ("nic"/"nicolas")
+    if not a or not b:
+        return False
+    if len(a) <= 2 or len(b) <= 2:
+        return a[0] == b[0]
+    return a.startswith(b) or b.startswith(a)
+
+
+class NameIndex:
+    """
+    Resolves player names to records in O(1) per lookup.
+
+    Names are normalized once when the index is built. A lookup tries the
+    exception table, then an exact match on the normalized name, then a
+    unique match on last name (suffixes like Jr./Sr. dropped) with a
+    compatible first name. Names that could not be resolved are collected
+    so they can be reported once with log_summary.
+    """
+
+    def __init__(self, records, key, exceptions=name_exceptions):
+        self.exact = {}
+        self.by_last_name = {}
+        for record in records:
+            normalized = normalize_name(record[key])
+            self.exact.setdefault(normalized, record)
+            first, last = split_name(normalized)
+            self.by_last_name.setdefault(last, []).append((first, record))
+
+        self.exceptions = {
+            normalize_name(name): (SKIP if alias == SKIP else normalize_name(alias))
+            for name, alias in exceptions.items()
+        }
+        self.skipped = []
+        self.unmatched = []
+
+    def __len__(self):
+        return len(self.exact)
+
+    def fuzzy_match(self, normalized):
+        first, last = split_name(normalized)
+        candidates = [
+            record
+            for candidate_first, record in self.by_last_name.get(last, [])
+            if first_names_match(first, candidate_first)
+        ]
+        return candidates[0] if len(candidates) == 1 else None
+
+    def resolve(self, name):
+        normalized = normalize_name(name)
+        alias = self.exceptions.get(normalized)
+        if alias == SKIP:
+            self.skipped.append(name)
+            return None
+        if alias is not None:
+            normalized = alias
+
+        record = self.exact.get(normalized) or self.fuzzy_match(normalized)
+        if record is None:
+            self.unmatched.append(name)
+        return record
+
+    def log_summary(self, logger, label):
+        if self.skipped:
+            logger.info(
+                f"  -   Manually skipped {len(self.skipped)} {label} players: "
+                + ", ".join(self.skipped)
+            )
+        if self.unmatched:
+            logger.info(
+                f"  -   Could not find {label} data for {len(self.unmatched)} "
+                "players: " + ", ".join(self.unmatched)
+            )
@@ -0,0 +1,124 @@
+"""
+Prefork serving: one listening socket, N waitress worker processes.
+
+The parent loads and warms every dataset, then forks the workers, so
+they all share the parent's parsed players and encoded bodies through
+copy-on-write pages instead of each parsing its own copy. gc.freeze()
+moves those objects out of the collector's reach, so collections in the
+workers don't write to (and copy) the shared pages. Each worker runs its
+own GIL, so encoding and compression scale with the number of cores.
+
+Services are other long-running jobs (e.g. the background refresh) that
+get a process of their own, forked the same way. A worker or service
+that exits is replaced, after a delay that doubles each time it exits
+soon after starting, so one that crashes on start doesn't fork in a
+tight loop; SIGINT/SIGTERM stop them all.
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+
+from waitress import serve
+
+logger = logging.getLogger(__name__)
+
+# Delays before replacing a process that exited within min_uptime seconds
+# of starting: doubled from the first up to the last
+restart_delay = (0.5, 30.0)
+min_uptime = 10.0
+
+
+def listen(host, port):
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.create_server((host, port), family=family, backlog=1024)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_child(target):
+    # Back to default handlers: the parent's would act on the whole pool
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    code = 0
+    try:
+        target()
+    except BaseException:
+        logger.exception(f"Process {os.getpid()} crashed")
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def spawn(target):
+    pid = os.fork()
+    if pid == 0:
+        run_child(target)
+    logger.info(f"Started {target.__name__} {pid}")
+    return pid
+
+
+def serve_prefork(
+    app, host, port, workers, threads, preload=None, worker_init=None, services=()
+):
+    sock = listen(host, port)
+    if preload:
+        preload()
+    gc.freeze()
+
+    def worker():
+        if worker_init:
+            worker_init()
+        serve(app, sockets=[sock], threads=threads)
+
+    # pid -> (what the process runs, when it started), to replace it
+    children = {}
+    for target in [worker] * workers + list(services):
+        children[spawn(target)] = (target, time.monotonic())
+    delays = {}  # target -> delay before its next restart
+    stopping = False
+
+    def stop(signum, _):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass  # Already exited and reaped
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    logger.info(f"Serving on {host}:{port} with {workers} workers x {threads} threads")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        child = children.pop(pid, None)
+        if child is None or stopping:
+            continue
+        target, started = child
+        if time.monotonic() - started >= min_uptime:
+            # Ran long enough: replaced at once, with the backoff reset
+            delays.pop(target, None)
+            delay = 0.0
+        else:
+            delay = delays.get(target, restart_delay[0])
+            delays[target] = min(delay * 2, restart_delay[1])
+        logger.warning(
+            f"{target.__name__} {pid} exited ({status}), restarting in {delay:.1f}s"
+        )
+        deadline = time.monotonic() + delay
+        # Slept in steps, so a stop signal doesn't wait out the whole delay
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(max(min(0.1, deadline - time.monotonic()), 0))
+        if not stopping:
+            children[spawn(target)] = (target, time.monotonic())
+    sock.close()
@@ -0,0 +1,164 @@
+"""
+Filtering, field projection, sorting and pagination for the players
+endpoint.
+
+Filters are answered from the dataset's PlayerIndexes, sort orders are
+computed once per dataset (see YearDataset.memoize) and pages are slices
+of them, so a request never scans or sorts the player list.
+"""
+
+from models import Player, PlayerStats
+
+# "id" is always returned so clients can join pages and projections
+player_fields = Player.fields
+sort_fields = (
+    "rank",
+    "adp",
+    "age",
+    "first_name",
+    "last_name",
+    "team",
+    "years_pro",
+    "height",
+    "weight",
+    "auction_hashtag",
+    "auction_yahoo_avg",
+    "auction_espn_avg",
+    "auction_blend_avg",
+) + PlayerStats.fields
+
+
+class PlayersQuery:
+    teams: tuple | None
+    positions: tuple | None  # Players eligible at any of them
+    healthy: bool | None  # True without injuries, False with
+    fields: tuple | None  # None returns every field
+    sort: str | None  # "pts" ascending, "-pts" descending
+    offset: int
+    limit: int | None
+
+    def __init__(
+        self,
+        teams=None,
+        positions=None,
+        healthy=None,
+        fields=None,
+        sort=None,
+        offset=0,
+        limit=None,
+    ):
+        self.teams = teams
+        self.positions = positions
+        self.healthy = healthy
+        self.fields = fields
+        self.sort = sort
+        self.offset = offset
+        self.limit = limit
+
+    @classmethod
+    def from_args(cls, args):
+        """Build a query from request args; raises ValueError."""
+        return cls(
+            teams=parse_list(args.get("team"), str.upper),
+            positions=parse_list(args.get("pos"), str.upper),
+            healthy=parse_flag(args.get("healthy"), "healthy"),
+            fields=parse_fields(args.get("fields")),
+            sort=parse_sort(args.get("sort")),
+            offset=parse_count(args.get("offset"), "offset", 0),
+            limit=parse_count(args.get("limit"), "limit", None),
+        )
+
+    @property
+    def key(self):
+        return (
+            self.teams,
+            self.positions,
+            self.healthy,
+            self.fields,
+            self.sort,
+            self.offset,
+            self.limit,
+        )
+
+    def is_default(self):
+        return self.key == (None, None, None, None, None, 0, None)
+
+    def is_filtered(self):
+        return bool(self.teams or self.positions or self.healthy is not None)
+
+
+def parse_list(value, normalize):
+    if not value:
+        return None
+    # Sorted so "PG,SG" and "SG,PG" share a cached body
+    return tuple(sorted({normalize(part.strip()) for part in value.split(",")}))
+
+
+def parse_flag(value, name):
+    if value is None or value == "":
+        return None
+    if value.lower() in ("1", "true"):
+        return True
+    if value.lower() in ("0", "false"):
+        return False
+    raise ValueError(f"Invalid {name}: {value}")
+
+
+def parse_fields(value):
+    if not value:
+        return None
+    requested = {part.strip() for part in value.split(",") if part.strip()}
+    unknown = requested - set(player_fields)
+    if unknown:
+        raise ValueError(f"Invalid fields: {', '.join(sorted(unknown))}")
+    # Canonical order, so "rank,id" and "id,rank" share a cached body
+    return tuple(f for f in player_fields if f in requested or f == "id")
+
+
+def parse_sort(value):
+    if not value:
+        return None
+    if value.lstrip("-") not in sort_fields:
+        raise ValueError(f"Invalid sort field: {value.lstrip('-')}")
+    return value
+
+
+def parse_count(value, name, default):
+    if value is None or value == "":
+        return default
+    try:
+        count = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value}")
+    if count < 0:
+        raise ValueError(f"Invalid {name}: {value}")
+    return count
+
+
+def sort_value(player, field):
+    if field in PlayerStats.fields:
+        return player["stats"][field] if player["stats"] else None
+    return player[field]
+
+
+def sort_order(players, sort):
+    """
+    Indices of players ordered by one field. Ties keep the stored order
+    (projection rank) and players without a value always come last.
+    """
+    field = sort.lstrip("-")
+    descending = sort.startswith("-")
+    values = [sort_value(player, field) for player in players]
+    present = [i for i, value in enumerate(values) if value is not None]
+    missing = [i for i, value in enumerate(values) if value is None]
+    if descending:
+        # Sort ascending over the reversed list, then reverse back, to keep
+        # ties stable in their original order
+        present = sorted(reversed(present), key=values.__getitem__)[::-1]
+    else:
+        present = sorted(present, key=values.__getitem__)
+    return present + missing
+
+
+def project(player, fields):
+    return {field: player[field] for field in fields}
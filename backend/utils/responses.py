@@ -0,0 +1,108 @@
+import gzip
+import hashlib
+
+from flask import Response
+
+from models import dumps
+from utils import config
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+class EncodedBody:
+    """
+    A JSON response body encoded once, with its compressed variants.
+
+    The ETag is derived from the raw bytes, so it only changes when the
+    underlying data does. Each encoding gets its own strong validator.
+    """
+
+    etag: str
+    variants: dict[str, bytes]  # content-coding -> bytes ("identity" is raw)
+
+    def __init__(self, raw, level=9):
+        # level is the gzip level; brotli uses the matching end of its scale
+        digest = hashlib.sha256(raw).hexdigest()[:32]
+        self.etag = digest
+        self.variants = {
+            "identity": raw,
+            "gzip": gzip.compress(raw, level, mtime=0),
+        }
+        if brotli is not None:
+            quality = 11 if level >= 9 else level
+            self.variants["br"] = brotli.compress(raw, quality=quality)
+
+    def etag_for(self, encoding):
+        if encoding == "identity":
+            return f'"{self.etag}"'
+        return f'"{self.etag}-{encoding}"'
+
+    def matches(self, if_none_match):
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag.strip('"').split("-")[0] == self.etag:
+                return True
+        return False
+
+
+def encode_json(payload, level=9):
+    # Bodies built per query rather than per dataset use a cheaper level
+    return EncodedBody(dumps(payload), level)
+
+
+def parse_accept_encoding(header):
+    encodings = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[coding] = q
+    return encodings
+
+
+def choose_encoding(body, accept_encoding):
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ("br", "gzip"):
+        if encoding in body.variants and accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return "identity"
+
+
+def cached_response(body, request, headers=None):
+    encoding = choose_encoding(body, request.headers.get("Accept-Encoding"))
+    headers = {
+        **(headers or {}),
+        "ETag": body.etag_for(encoding),
+        "Cache-Control": f"public, max-age={config.CACHE_MAX_AGE}, must-revalidate",
+        "Vary": "Accept-Encoding",
+    }
+
+    if body.matches(request.headers.get("If-None-Match")):
+        return Response(status=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(
+        body.variants[encoding],
+        status=200,
+        headers=headers,
+        mimetype="application/json",
+    )
@@ -0,0 +1,77 @@
+"""
+Background jobs for the server process.
+
+Periodic runs a job every `interval` seconds, the first time one
+interval after it starts, on a daemon thread or in the calling one; a
+failed run is logged and the next one still happens.
+CachedSource reuses a fetcher's result for a while, so sources that
+rarely change (projections) are fetched less often than the job runs.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CachedSource:
+    """A fetcher whose last result is reused for max_age seconds."""
+
+    def __init__(self, fetch, max_age, clock=time.monotonic):
+        self.fetch = fetch
+        self.max_age = max_age
+        self.clock = clock
+        self._value = None
+        self._fetched_at = None
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            now = self.clock()
+            if self._fetched_at is None or now - self._fetched_at >= self.max_age:
+                self._value = self.fetch()
+                self._fetched_at = now
+            return self._value
+
+
+class Periodic:
+    def __init__(self, name, job, interval):
+        self.name = name
+        self.job = job
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        start = time.perf_counter()
+        try:
+            self.job()
+        except Exception:
+            logger.exception(f"{self.name} failed")
+        else:
+            logger.info(f"{self.name} ran in {time.perf_counter() - start:.2f}s")
+
+    def run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            self.run_once()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def trigger(self):
+        """Run now instead of at the end of the interval."""
+        self._wake.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,127 @@
+"""
+Server-side version of the rankings page's nScores (frontend/src/data).
+
+For every player, each category gets a z-score against the season totals
+and a min-max score against the per game stats; they are blended and
+normalized the same way the browser does, and the punt-adjusted total is
+the sum of the categories that are not punted.
+"""
+
+import numpy as np
+
+# Punt keys used by the frontend, in the order of score_categories
+punt_keys = ["fg", "ft", "tpm", "pts", "reb", "ast", "stl", "blk", "to"]
+score_categories = [
+    "fg_impact",
+    "ft_impact",
+    "tpm",
+    "pts",
+    "reb",
+    "ast",
+    "stl",
+    "blk",
+    "to",
+]
+
+# "totals" weighs by projected games played, "per" assumes a full season
+modes = {"totals": None, "per": 82.0}
+
+z_weights = np.array([1, 1, 1, 1, 1, 1, 1, 1, 0.25])
+minmax_weight = 8
+to_index = score_categories.index("to")
+
+
+def parse_punts(value):
+    """Turn "fg,to" into a bitmask over punt_keys; raises ValueError."""
+    mask = 0
+    for key in filter(None, (part.strip() for part in (value or "").split(","))):
+        if key not in punt_keys:
+            raise ValueError(f"Invalid punt category: {key}")
+        mask |= 1 << punt_keys.index(key)
+    return mask
+
+
+def punts_from_mask(mask):
+    return [key for i, key in enumerate(punt_keys) if mask & (1 << i)]
+
+
+def category_arrays(category_stats, field):
+    return np.array([category_stats[key][field] for key in score_categories])
+
+
+def calc_z_scores(stats, gp, category_stats_totals):
+    means = category_arrays(category_stats_totals, "mean")
+    stds = category_arrays(category_stats_totals, "std")
+    z = (stats * gp[:, None] - means) / stds
+    z[:, to_index] *= -1
+    return z
+
+
+def calc_minmax_scores(stats, category_stats_per):
+    mins = category_arrays(category_stats_per, "min")
+    maxs = category_arrays(category_stats_per, "max")
+    span = maxs - mins
+    scaled = np.divide(stats - mins, span, out=np.zeros_like(stats), where=span != 0)
+    minmax = 2 * scaled - 1
+    minmax[:, to_index] = (1 - 2 * scaled[:, to_index]) * 0.25
+    minmax[:, span == 0] = 0
+    return minmax
+
+
+def normalize_scores(scores):
+    normalized = (scores + 2.5) / 3.8
+    normalized[:, to_index] = scores[:, to_index] / 2
+    return normalized
+
+
+class ScoreTable:
+    """
+    Scores for one season and mode, with the ranking of every punt set.
+
+    There are only 2^9 punt combinations, so all of them are computed up
+    front: each is one mask-weighted sum and one argsort.
+    """
+
+    def __init__(self, year_data, mode):
+        players = [p for p in year_data.players if p["stats"] is not None]
+        stats = np.array(
+            [[p["stats"][key] for key in score_categories] for p in players],
+            dtype=np.float64,
+        ).reshape(len(players), len(score_categories))
+        if modes[mode] is None:
+            gp = np.array([p["stats"]["gp"] for p in players], dtype=np.float64)
+        else:
+            gp = np.full(len(players), modes[mode])
+
+        self.year = year_data.year
+        self.mode = mode
+        self.ids = np.array([p["id"] for p in players])
+        self.z_scores = calc_z_scores(stats, gp, year_data.category_stats_totals)
+        minmax = calc_minmax_scores(stats, year_data.category_stats_per)
+        self.n_scores = normalize_scores(
+            z_weights * self.z_scores + minmax_weight * minmax
+        )
+
+        masks = np.array(
+            [
+                [0.0 if mask & (1 << i) else 1.0 for i in range(len(punt_keys))]
+                for mask in range(1 << len(punt_keys))
+            ]
+        )
+        # (punt sets, players)
+        self.totals = masks @ self.n_scores.T
+        self.orders = np.argsort(-self.totals, axis=1, kind="stable")
+
+    def ranking(self, mask):
+        order = self.orders[mask]
+        totals = self.totals[mask]
+        return [
+            {
+                "id": int(self.ids[i]),
+                "rank": rank,
+                "total": float(totals[i]),
+                "n_scores": dict(zip(score_categories, self.n_scores[i].tolist())),
+                "z_scores": dict(zip(score_categories, self.z_scores[i].tolist())),
+            }
+            for rank, i in enumerate(order, start=1)
+        ]
@@ -0,0 +1,92 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+from utils.names import SKIP, name_exceptions, normalize_name
+
+
+def trigrams(term):
+    padded = f" {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerSearchIndex:
+    """
+    Name search over one season's players, built when it is loaded.
+
+    Names are normalized like the pipeline matches them ("Dončić" finds
+    "doncic", "pj" finds "P.J."), and the name_exceptions aliases are
+    searchable too, so "Nicolas Claxton" finds Nic Claxton. Every word
+    of a name goes into a sorted term list, where a prefix is a binary
+    search; trigrams of the same words back a fuzzy fallback for typos.
+    """
+
+    min_similarity = 0.4
+
+    def __init__(self, players):
+        aliases = defaultdict(list)
+        for name, alias in name_exceptions.items():
+            if alias != SKIP:
+                aliases[normalize_name(alias)].append(normalize_name(name))
+
+        self.names = []  # Every normalized name per player position
+        terms = set()
+        self.by_trigram = defaultdict(set)
+        for i, player in enumerate(players):
+            name = normalize_name(f"{player['first_name']} {player['last_name']}")
+            names = [name, *aliases.get(name, [])]
+            self.names.append(names)
+            for word in {word for name in names for word in name.split(" ")}:
+                terms.add((word, i))
+                for gram in trigrams(word):
+                    self.by_trigram[gram].add(i)
+        self.terms = sorted(terms)
+
+    def prefix_matches(self, prefix):
+        matches = set()
+        start = bisect_left(self.terms, (prefix,))
+        for term, i in self.terms[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.add(i)
+        return matches
+
+    def names_match(self, i, words):
+        # Every query word starts some word of one of the player's names
+        return any(
+            all(
+                any(part.startswith(word) for part in name.split(" ")) for word in words
+            )
+            for name in self.names[i]
+        )
+
+    def fuzzy_matches(self, words):
+        grams = set().union(*(trigrams(word) for word in words))
+        counts = defaultdict(int)
+        for gram in grams:
+            for i in self.by_trigram.get(gram, ()):
+                counts[i] += 1
+        scores = {i: count / len(grams) for i, count in counts.items()}
+        return sorted(
+            (i for i, score in scores.items() if score >= self.min_similarity),
+            key=lambda i: (-scores[i], i),
+        )
+
+    def search(self, query, limit=10):
+        """
+        Positions of the best matches: prefix matches by exact name and
+        then by rank, or fuzzy matches by similarity when nothing matches.
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        words = normalized.split(" ")
+
+        # Candidates from the longest word, the most selective prefix
+        candidates = self.prefix_matches(max(words, key=len))
+        matches = sorted(
+            (i for i in candidates if self.names_match(i, words)),
+            key=lambda i: (normalized not in self.names[i], i),
+        )
+        if not matches:
+            matches = self.fuzzy_matches(words)
+        return matches[:limit]
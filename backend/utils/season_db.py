@@ -0,0 +1,436 @@
+"""
+SQLite store of every season, current and archived.
+
+    seasons         year, source ("season" or "archive"), players, updated_at
+    players         one row per (season, player_id), ord keeps rank order
+    positions       (season, player_id, ord) -> position
+    stats           per-game PlayerStats of each (season, player_id)
+    injuries        (season, player_id, ord) -> injury, details as JSON
+    category_stats  (season, kind, category) -> min/max/mean/std, in order
+
+A season is replaced in a single transaction with executemany, so
+readers see either the old season or the new one. Seasons read back have
+the same shape as utils.storage.read_season.
+
+    PYTHONPATH=. python3 -m utils.season_db    # import data/seasons and
+                                               # data/archive
+"""
+
+import logging
+import os
+import pathlib
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+from models import PlayerStats, dumps, loads
+from utils import storage
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    year TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    players INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    season TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    ord INTEGER NOT NULL,
+    first_name TEXT,
+    last_name TEXT,
+    team_id INTEGER,
+    team TEXT,
+    age INTEGER,
+    headshot TEXT,
+    years_pro INTEGER,
+    jersey INTEGER,
+    height INTEGER,
+    weight INTEGER,
+    draft_year INTEGER,
+    draft_round INTEGER,
+    draft_selection INTEGER,
+    rank INTEGER,
+    adp REAL,
+    auction_hashtag REAL,
+    auction_yahoo_avg REAL,
+    auction_espn_avg REAL,
+    auction_blend_avg REAL,
+    PRIMARY KEY (season, player_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_by_team ON players (season, team);
+CREATE INDEX IF NOT EXISTS players_by_id ON players (player_id, season);
+CREATE TABLE IF NOT EXISTS positions (
+    season TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    ord INTEGER NOT NULL,
+    position TEXT NOT NULL,
+    PRIMARY KEY (season, player_id, ord)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS positions_by_position ON positions (season, position);
+CREATE TABLE IF NOT EXISTS stats (
+    season TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    gp REAL, mpg REAL, fgm REAL, fga REAL, fg_impact REAL, ftm REAL, fta REAL,
+    ft_impact REAL, tpm REAL, pts REAL, reb REAL, ast REAL, stl REAL, blk REAL,
+    "to" REAL,
+    PRIMARY KEY (season, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS injuries (
+    season TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    ord INTEGER NOT NULL,
+    injury_id INTEGER,
+    long_comment TEXT,
+    short_comment TEXT,
+    status TEXT,
+    date TEXT,
+    details TEXT,
+    PRIMARY KEY (season, player_id, ord)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS category_stats (
+    season TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    category TEXT NOT NULL,
+    ord INTEGER NOT NULL,
+    min REAL,
+    max REAL,
+    mean REAL,
+    std REAL,
+    PRIMARY KEY (season, kind, category)
+) WITHOUT ROWID;
+"""
+
+SEASON_TABLES = ["players", "positions", "stats", "injuries", "category_stats"]
+PLAYER_COLUMNS = [
+    "first_name",
+    "last_name",
+    "team_id",
+    "team",
+    "age",
+    "headshot",
+    "years_pro",
+    "jersey",
+    "height",
+    "weight",
+]
+AUCTION_COLUMNS = [
+    "auction_hashtag",
+    "auction_yahoo_avg",
+    "auction_espn_avg",
+    "auction_blend_avg",
+]
+STAT_COLUMNS = ", ".join(f'"{field}"' for field in PlayerStats.fields)
+CATEGORY_FIELDS = ["min", "max", "mean", "std"]
+
+
+def connect(db_path=storage.DATABASE_FILE, create=False):
+    # Only writers create the store and its schema; readers, on the request
+    # path, open it read-only and run nothing but their queries
+    if not create:
+        uri = f"{pathlib.Path(db_path).absolute().as_uri()}?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+    connection = sqlite3.connect(db_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def placeholders(count):
+    return ", ".join("?" * count)
+
+
+"""
+========================================
+Writing
+========================================
+"""
+
+
+def player_row(year, ord, player):
+    draft = player["draft"] or {}
+    return (
+        year,
+        player["id"],
+        ord,
+        *(player[column] for column in PLAYER_COLUMNS),
+        draft.get("year"),
+        draft.get("round"),
+        draft.get("selection"),
+        player["rank"],
+        player["adp"],
+        *(player[column] for column in AUCTION_COLUMNS),
+    )
+
+
+def category_rows(year, kind, category_stats):
+    return [
+        (year, kind, category, i, *(values.get(field) for field in CATEGORY_FIELDS))
+        for i, (category, values) in enumerate(category_stats.items())
+    ]
+
+
+def write_season(
+    year,
+    players,
+    category_stats_totals,
+    category_stats_per,
+    source="season",
+    db_path=storage.DATABASE_FILE,
+):
+    """Replace one season, in one transaction. players: models or dicts."""
+    players = loads(dumps(players))
+    with closing(connect(db_path, create=True)) as connection, connection:
+        for table in SEASON_TABLES:
+            connection.execute(f"DELETE FROM {table} WHERE season = ?", (year,))
+
+        connection.executemany(
+            f"INSERT INTO players VALUES ({placeholders(22)})",
+            (player_row(year, i, p) for i, p in enumerate(players)),
+        )
+        connection.executemany(
+            "INSERT INTO positions VALUES (?, ?, ?, ?)",
+            (
+                (year, p["id"], i, position)
+                for p in players
+                for i, position in enumerate(p["positions"])
+            ),
+        )
+        connection.executemany(
+            f"INSERT INTO stats VALUES ({placeholders(2 + len(PlayerStats.fields))})",
+            (
+                (year, p["id"], *(p["stats"][f] for f in PlayerStats.fields))
+                for p in players
+                if p["stats"] is not None
+            ),
+        )
+        connection.executemany(
+            f"INSERT INTO injuries VALUES ({placeholders(9)})",
+            (
+                (
+                    year,
+                    p["id"],
+                    i,
+                    injury["id"],
+                    injury["long_comment"],
+                    injury["short_comment"],
+                    injury["status"],
+                    injury["date"],
+                    None if injury["details"] is None else dumps(injury["details"]),
+                )
+                for p in players
+                for i, injury in enumerate(p["injuries"])
+            ),
+        )
+        connection.executemany(
+            f"INSERT INTO category_stats VALUES ({placeholders(8)})",
+            category_rows(year, "totals", category_stats_totals)
+            + category_rows(year, "per", category_stats_per),
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO seasons VALUES (?, ?, ?, ?)",
+            (
+                year,
+                source,
+                len(players),
+                datetime.now(timezone.utc).isoformat(timespec="microseconds"),
+            ),
+        )
+
+
+"""
+========================================
+Reading
+========================================
+"""
+
+
+def available_seasons(db_path=storage.DATABASE_FILE):
+    if not os.path.exists(db_path):
+        return []
+    with closing(connect(db_path)) as connection:
+        return [year for (year,) in connection.execute("SELECT year FROM seasons")]
+
+
+def season_updated_at(year, db_path=storage.DATABASE_FILE):
+    if not os.path.exists(db_path):
+        return None
+    with closing(connect(db_path)) as connection:
+        row = connection.execute(
+            "SELECT updated_at FROM seasons WHERE year = ?", (year,)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def group_by_player(rows):
+    grouped = {}
+    for player_id, *values in rows:
+        grouped.setdefault(player_id, []).append(values)
+    return grouped
+
+
+def injury_record(injury_id, long_comment, short_comment, status, date, details):
+    return {
+        "id": injury_id,
+        "long_comment": long_comment,
+        "short_comment": short_comment,
+        "status": status,
+        "date": date,
+        "details": None if details is None else loads(details),
+    }
+
+
+def read_category_stats(connection, year, kind):
+    rows = connection.execute(
+        "SELECT category, min, max, mean, std FROM category_stats "
+        "WHERE season = ? AND kind = ? ORDER BY ord",
+        (year, kind),
+    )
+    # The per game stats have no std; fields that were absent stay absent
+    return {
+        category: {
+            field: value
+            for field, value in zip(CATEGORY_FIELDS, values)
+            if value is not None
+        }
+        for category, *values in rows
+    }
+
+
+def read_season(year, db_path=storage.DATABASE_FILE):
+    """The season in read_season's shape; raises KeyError when absent."""
+    if not os.path.exists(db_path):
+        raise KeyError(year)
+    with closing(connect(db_path)) as connection:
+        if not connection.execute(
+            "SELECT 1 FROM seasons WHERE year = ?", (year,)
+        ).fetchone():
+            raise KeyError(year)
+
+        stats = {
+            player_id: dict(zip(PlayerStats.fields, values))
+            for player_id, *values in connection.execute(
+                f"SELECT player_id, {STAT_COLUMNS} FROM stats WHERE season = ?",
+                (year,),
+            )
+        }
+        positions = group_by_player(
+            connection.execute(
+                "SELECT player_id, position FROM positions "
+                "WHERE season = ? ORDER BY player_id, ord",
+                (year,),
+            )
+        )
+        injuries = group_by_player(
+            connection.execute(
+                "SELECT player_id, injury_id, long_comment, short_comment, status, "
+                "date, details FROM injuries WHERE season = ? ORDER BY player_id, ord",
+                (year,),
+            )
+        )
+        rows = connection.execute(
+            "SELECT player_id, "
+            + ", ".join(PLAYER_COLUMNS)
+            + ", draft_year, draft_round, draft_selection, rank, adp, "
+            + ", ".join(AUCTION_COLUMNS)
+            + " FROM players WHERE season = ? ORDER BY ord",
+            (year,),
+        ).fetchall()
+        totals = read_category_stats(connection, year, "totals")
+        per = read_category_stats(connection, year, "per")
+
+    players = []
+    for player_id, *values in rows:
+        record = dict(zip(PLAYER_COLUMNS, values))
+        draft_year, draft_round, draft_selection, rank, adp, *auction = values[
+            len(PLAYER_COLUMNS) :
+        ]
+        players.append(
+            {
+                "id": player_id,
+                "first_name": record["first_name"],
+                "last_name": record["last_name"],
+                "positions": [position for (position,) in positions.get(player_id, [])],
+                "team_id": record["team_id"],
+                "team": record["team"],
+                "age": record["age"],
+                "headshot": record["headshot"],
+                "years_pro": record["years_pro"],
+                "jersey": record["jersey"],
+                "height": record["height"],
+                "weight": record["weight"],
+                "injuries": [
+                    injury_record(*row) for row in injuries.get(player_id, [])
+                ],
+                "draft": (
+                    None
+                    if draft_year is None
+                    else {
+                        "year": draft_year,
+                        "round": draft_round,
+                        "selection": draft_selection,
+                    }
+                ),
+                "rank": rank,
+                "adp": adp,
+                "stats": stats.get(player_id),
+                **dict(zip(AUCTION_COLUMNS, auction)),
+            }
+        )
+    return storage.season_record(players, totals, per)
+
+
+"""
+========================================
+Importing the JSON seasons and archives
+========================================
+"""
+
+
+def from_archive(player):
+    # Archives predate auction_hashtag and store keys alphabetically
+    player = dict(player)
+    if "auction_valued_at" in player:
+        player["auction_hashtag"] = player.pop("auction_valued_at")
+    return player
+
+
+def import_all(
+    seasons_dir=storage.SEASONS_DIR,
+    archive_dir=storage.ARCHIVE_DIR,
+    db_path=storage.DATABASE_FILE,
+):
+    # A season file wins over an archive of the same year
+    seasons = storage.available_seasons(seasons_dir)
+    for year in seasons:
+        season = storage.read_season(year, seasons_dir)
+        write_season(
+            year,
+            season["players"],
+            season["category_stats_totals"],
+            season["category_stats_per"],
+            source="season",
+            db_path=db_path,
+        )
+        logger.info(f"Imported season {year}")
+    for year in storage.available_archives(archive_dir):
+        if year in seasons:
+            continue
+        archive = storage.read_archive(year, archive_dir)
+        write_season(
+            year,
+            [from_archive(p) for p in archive["players"]],
+            archive["category_stats_totals"],
+            archive["category_stats_per"],
+            source="archive",
+            db_path=db_path,
+        )
+        logger.info(f"Imported archive {year}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    import_all()
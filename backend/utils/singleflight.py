@@ -0,0 +1,57 @@
+import threading
+
+from werkzeug.exceptions import ServiceUnavailable
+
+from utils import config
+
+
+class WaitTimeout(ServiceUnavailable):
+    description = "Timed out waiting for the response to be built, try again"
+
+
+class Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent computations of the same key: the first caller
+    runs it and the others wait for its result, at most `timeout` seconds,
+    instead of computing it again. An error is raised to every caller.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = config.COALESCE_TIMEOUT if timeout is None else timeout
+        self.coalesced = 0  # Callers that waited on another's computation
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Call()
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = compute()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+        if not call.done.wait(self.timeout):
+            raise WaitTimeout()
+        if call.error is not None:
+            raise call.error
+        return call.result
@@ -0,0 +1,37 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """Wall-clock duration of each named stage of a run, in seconds."""
+
+    def __init__(self):
+        self.durations = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.durations[name] = time.perf_counter() - start
+
+    def timed(self, name, fn):
+        # For stages handed to an executor
+        def run(*args, **kwargs):
+            with self.stage(name):
+                return fn(*args, **kwargs)
+
+        return run
+
+    def log(self, logger):
+        logger.info(
+            "=== Stage durations: "
+            + ", ".join(
+                f"{name} {seconds:.2f}s" for name, seconds in self.durations.items()
+            )
+            + " ==="
+        )
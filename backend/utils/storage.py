@@ -0,0 +1,159 @@
+"""
+Storage layout
+    data/seasons/manifest.json  {"seasons": {"2024": {"file": ..., ...}}}
+    data/seasons/<year>.json    {"players": [...],
+                                 "category_stats_totals": {...},
+                                 "category_stats_per": {...},
+                                 "fingerprints": {...}}
+    data/seasons/pipeline_metrics.json
+                                Stage durations of the last refresh of each
+                                season, exported by /api/metrics.
+    data/archive/<year>_players.json
+                                Snapshots in the API response format, read
+                                through read_archive into the same shape.
+
+Every file is written to a temp file in the same directory and moved into
+place with os.replace, so readers only ever see a complete file and a
+refresh of one season never touches the others.
+"""
+
+import os
+import tempfile
+from datetime import datetime, timezone
+
+from models import dumps, loads
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data")
+SEASONS_DIR = os.path.join(DATA_DIR, "seasons")
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+DATABASE_FILE = os.path.join(DATA_DIR, "seasons.sqlite3")
+MANIFEST_FILE = "manifest.json"
+PIPELINE_METRICS_FILE = "pipeline_metrics.json"
+
+
+def atomic_write_json(path, data):
+    dirname = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dirname, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_json(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def manifest_path(seasons_dir=SEASONS_DIR):
+    return os.path.join(seasons_dir, MANIFEST_FILE)
+
+
+def season_path(year, seasons_dir=SEASONS_DIR):
+    return os.path.join(seasons_dir, f"{year}.json")
+
+
+def archive_path(year, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, f"{year}_players.json")
+
+
+def read_manifest(seasons_dir=SEASONS_DIR):
+    try:
+        return read_json(manifest_path(seasons_dir))
+    except FileNotFoundError:
+        return {"seasons": {}}
+
+
+def available_seasons(seasons_dir=SEASONS_DIR):
+    return sorted(read_manifest(seasons_dir)["seasons"])
+
+
+def available_archives(archive_dir=ARCHIVE_DIR):
+    suffix = "_players.json"
+    return sorted(
+        name[: -len(suffix)]
+        for name in os.listdir(archive_dir)
+        if name.endswith(suffix)
+    )
+
+
+def season_record(
+    players, category_stats_totals, category_stats_per, fingerprints=None
+):
+    record = {
+        "players": players,
+        "category_stats_totals": category_stats_totals,
+        "category_stats_per": category_stats_per,
+    }
+    if fingerprints is not None:
+        # player id -> hash of the source records the player was built from
+        record["fingerprints"] = fingerprints
+    return record
+
+
+def read_season(year, seasons_dir=SEASONS_DIR):
+    return read_json(season_path(year, seasons_dir))
+
+
+def read_archive(year, archive_dir=ARCHIVE_DIR):
+    data = read_json(archive_path(year, archive_dir))
+    return season_record(
+        data[f"{year}_players"],
+        data[f"{year}_category_stats_total"],
+        data[f"{year}_category_stats_per"],
+    )
+
+
+def write_season(
+    year,
+    players,
+    category_stats_totals,
+    category_stats_per,
+    seasons_dir=SEASONS_DIR,
+    fingerprints=None,
+):
+    os.makedirs(seasons_dir, exist_ok=True)
+    atomic_write_json(
+        season_path(year, seasons_dir),
+        season_record(players, category_stats_totals, category_stats_per, fingerprints),
+    )
+
+    # The manifest is updated last, so it never lists a missing shard
+    manifest = read_manifest(seasons_dir)
+    manifest["seasons"][year] = {
+        "file": os.path.basename(season_path(year, seasons_dir)),
+        "players": len(players),
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    atomic_write_json(manifest_path(seasons_dir), manifest)
+
+
+def pipeline_metrics_path(seasons_dir=SEASONS_DIR):
+    return os.path.join(seasons_dir, PIPELINE_METRICS_FILE)
+
+
+def read_pipeline_metrics(seasons_dir=SEASONS_DIR):
+    try:
+        return read_json(pipeline_metrics_path(seasons_dir))
+    except FileNotFoundError:
+        return {"seasons": {}}
+
+
+def write_pipeline_metrics(year, status, durations, seasons_dir=SEASONS_DIR):
+    os.makedirs(seasons_dir, exist_ok=True)
+    metrics = read_pipeline_metrics(seasons_dir)
+    metrics["seasons"][year] = {
+        "status": status,
+        "finished_at": datetime.now(timezone.utc).timestamp(),
+        "stages": durations,
+    }
+    atomic_write_json(pipeline_metrics_path(seasons_dir), metrics)
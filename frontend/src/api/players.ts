@@ -1,6 +1,5 @@
 import { Player } from "@/types/playerTypes";
 import { CategoryStats } from "@/types/statTypes";
-import toCamelCase from "@/utils/camelCase";
 import { EMPTY_CATEGORY_STATS } from "@/utils/consts";
 import { API_URL } from "@/utils/env";
 
@@ -17,15 +16,16 @@ const getPlayers = async (year: string): Promise<PlayerResponse> => {
   try {
     if (!AVAILABLE_YEARS.includes(year))
       throw new Error("Invalid year provided");
-    const response = await fetch(`${API_URL}/api/players/${year}`);
+    // The API camelCases the records itself
+    const response = await fetch(`${API_URL}/api/players/${year}?case=camel`);
     const data = await response.json();
-    const players = toCamelCase(data[`${year}_players`]) as Player[];
-    const categoryStatsPer = toCamelCase(
-      data[`${year}_category_stats_per`]
-    ) as CategoryStats;
-    const categoryStatsTotal = toCamelCase(
-      data[`${year}_category_stats_total`]
-    ) as CategoryStats;
+    const players = data[`${year}_players`] as Player[];
+    const categoryStatsPer = data[
+      `${year}_category_stats_per`
+    ] as CategoryStats;
+    const categoryStatsTotal = data[
+      `${year}_category_stats_total`
+    ] as CategoryStats;
     return { year, players, categoryStatsPer, categoryStatsTotal };
   } catch (error) {
     console.error("Error fetching players", error);